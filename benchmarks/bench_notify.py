@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compares syscalls and CPU time of an idle JournalWatcher per notification backend
+
+    python3 -m benchmarks.bench_notify --frames 3000
+"""
+import argparse
+import builtins
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock
+from data.journal import JournalWatcher
+from data.notify import create_notifier
+
+
+class SyscallCounter:
+    """
+    Wraps the os functions used by the watcher and counts the calls
+    """
+    NAMES = ['stat', 'listdir', 'read']
+
+    def __init__(self):
+        self.counts = {}
+        self.originals = {}
+
+    def __wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            self.counts[name] = self.counts.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        for name in self.NAMES:
+            self.originals[name] = getattr(os, name)
+            setattr(os, name, self.__wrap(name, self.originals[name]))
+        self.originals['open'] = builtins.open
+        builtins.open = self.__wrap('open', builtins.open)
+        return self
+
+    def __exit__(self, *args):
+        builtins.open = self.originals.pop('open')
+        for name, func in self.originals.items():
+            setattr(os, name, func)
+
+
+def make_journal_dir(lines):
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(directory, 'Journal.200101000000.01.log'), 'w') as fp:
+        for i in range(lines):
+            fp.write(json.dumps({"timestamp": "2020-01-01T00:00:00Z", "event": "Scan", "BodyID": i}) + "\n")
+    with open(os.path.join(directory, 'Journal.200101000000.02.log'), 'w') as fp:
+        fp.write(json.dumps({"timestamp": "2020-01-01T00:00:00Z", "event": "Music"}) + "\n")
+    with open(os.path.join(directory, 'status.json'), 'w') as fp:
+        json.dump({"timestamp": "2020-01-01T00:00:00Z", "Flags": 0}, fp)
+    return directory
+
+
+def run(backend, frames, lines):
+    directory = make_journal_dir(lines)
+    try:
+        journal = JournalWatcher(directory=directory, watch=['Scan'], config=MagicMock(),
+                                 notifier=create_notifier(directory, backend))
+        journal.include_pass_event()
+        # initial backfill is not idle time
+        journal.refresh()
+
+        with SyscallCounter() as counter:
+            cpu_start = time.process_time()
+            for _ in range(frames):
+                journal.refresh()
+                journal.get_status()
+            cpu = time.process_time() - cpu_start
+
+        journal.notifier.close()
+        return counter.counts, cpu
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Idle JournalWatcher benchmark')
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--lines', type=int, default=1000)
+    args = parser.parse_args()
+
+    for backend in ['polling', 'inotify']:
+        try:
+            counts, cpu = run(backend, args.frames, args.lines)
+        except OSError as e:
+            print('{}: unavailable ({})'.format(backend, e))
+            continue
+        total = sum(counts.values())
+        print('{:8} syscalls/frame: {:6.2f} ({}) cpu: {:.3f}s ({:.1f}us/frame)'.format(
+            backend,
+            total / args.frames,
+            ", ".join("{}={}".format(k, v) for k, v in sorted(counts.items())),
+            cpu,
+            cpu / args.frames * 1000000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Scoring every body of a large system against the POI rules
+
+    python3 -m benchmarks.bench_poi --bodies 150
+"""
+import argparse
+import random
+import time
+from collections import OrderedDict
+from overlays.poi import PoiRules
+
+PLANET_CLASSES = [
+    'Icy body', 'Rocky body', 'High metal content body', 'Metal rich body', 'Rocky ice body',
+    'Water world', 'Earthlike body', 'Ammonia world', 'Sudarsky class I gas giant', 'Gas giant with water based life',
+]
+
+
+def system_bodies(count):
+    random.seed(1)
+    bodies = OrderedDict()
+    bodies['0'] = {"BodyID": 0, "StarType": "K", "Radius": 500000000}
+    for body_id in range(1, count):
+        bodies[str(body_id)] = {
+            "BodyID": body_id,
+            "PlanetClass": random.choice(PLANET_CLASSES),
+            "TerraformState": random.choice(['', '', '', 'Terraformable']),
+            "Landable": random.random() < 0.5,
+            "SurfaceGravity": random.uniform(0.5, 25),
+            "Radius": random.uniform(1e6, 7e7),
+            "OrbitalRadius": random.uniform(1e8, 1e11),
+            "Parents": [{"Planet": random.randrange(0, body_id)}, {"Star": 0}],
+        }
+    return bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='POI rules benchmark')
+    parser.add_argument('--bodies', type=int, default=150)
+    parser.add_argument('--passes', type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = system_bodies(args.bodies)
+    rules = PoiRules()
+
+    start = time.perf_counter()
+    for _ in range(args.passes):
+        rules.evaluate(bodies)
+    elapsed = (time.perf_counter() - start) / args.passes
+    print('{} bodies: {:.3f}ms per pass ({:.1%} of a 60 fps frame)'.format(
+        len(bodies), elapsed * 1000, elapsed * 60))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Backfill of a large synthetic journal with and without the event name pre-filter
+
+    python3 -m benchmarks.bench_prefilter --lines 200000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock
+from data import journal as journal_module
+from data.journal import JournalWatcher
+from data.notify import PollingNotifier
+
+NOISE = [
+    {"event": "Music", "MusicTrack": "Exploration"},
+    {"event": "ReceiveText", "From": "", "Message": "$COMMS_entered:#name=Sample Sector;",
+     "Message_Localised": "Entered Channel: Sample Sector", "Channel": "local"},
+    {"event": "FSSSignalDiscovered", "SystemAddress": 1234567, "SignalName": "$USS_NonHumanSignalSource;",
+     "SignalName_Localised": "Non-Human signal source", "USSType": "$USS_Type_NonHuman;",
+     "USSType_Localised": "Non-Human signal source", "SpawningState": "", "SpawningFaction": "",
+     "ThreatLevel": 5, "TimeRemaining": 1234.5},
+    {"event": "FuelScoop", "Scooped": 5.0, "Total": 32.0},
+]
+WATCHED = [
+    {"event": "Scan", "ScanType": "AutoScan", "BodyName": "Sample Sector A 1", "BodyID": 2,
+     "StarSystem": "Sample Sector", "SystemAddress": 1234567, "PlanetClass": "Icy body", "Landable": True,
+     "SurfaceGravity": 1.2, "Radius": 1000000.0, "TerraformState": ""},
+    {"event": "FSDJump", "StarSystem": "Sample Sector", "SystemAddress": 1234567, "StarPos": [1.0, 2.0, 3.0]},
+]
+
+
+def make_journal(directory, lines, watched_ratio):
+    random.seed(1)
+    with open(os.path.join(directory, 'Journal.200101000000.01.log'), 'w') as fp:
+        for _ in range(lines):
+            source = WATCHED if random.random() < watched_ratio else NOISE
+            e = dict(random.choice(source))
+            e['timestamp'] = '2020-01-01T00:00:00Z'
+            fp.write(json.dumps(e, separators=(',', ':')) + "\n")
+
+
+def backfill(directory, watch, prefilter):
+    original = journal_module.peek_event_name
+    decoded = [0]
+    original_loads = journal_module.json.loads
+
+    def counting_loads(*args, **kwargs):
+        decoded[0] += 1
+        return original_loads(*args, **kwargs)
+
+    if not prefilter:
+        journal_module.peek_event_name = lambda line: None
+    journal_module.json.loads = counting_loads
+    try:
+        journal = JournalWatcher(directory=directory, watch=watch, config=MagicMock(), notifier=PollingNotifier())
+        start = time.perf_counter()
+        journal.refresh()
+        elapsed = time.perf_counter() - start
+    finally:
+        journal_module.peek_event_name = original
+        journal_module.json.loads = original_loads
+
+    return elapsed, decoded[0], len(journal.events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Journal pre-filter benchmark')
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--watched-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        make_journal(directory, args.lines, args.watched_ratio)
+        watch = ['Scan', 'FSDJump']
+        for prefilter in [False, True]:
+            elapsed, decoded, recorded = backfill(directory, watch, prefilter)
+            print('prefilter={:5} {:.3f}s decoded: {} recorded: {}'.format(
+                str(prefilter), elapsed, decoded, recorded))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Card construction time of the exploration and race layouts with and without the shared font pool
+
+    python3 -m benchmarks.bench_startup --runs 20
+"""
+import argparse
+import os
+import time
+from unittest.mock import MagicMock
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from overlays import cards
+from overlays.fonts import font_pool
+
+LAYOUTS = {
+    'exploration': [
+        (cards.ExplorationCard, dict(position=(0, 1), card_size=(1, 2))),
+        (cards.CurrentSystemCard, dict(position=(2, 1), text_align='right', card_size=(1, 2))),
+        (cards.RouteCard, dict(position=(0, 0), text_align='left', card_size=(3, 1))),
+    ],
+    'race': [
+        (cards.RaceCard, dict(position=(0, 0), card_size=(3, 3))),
+    ],
+}
+
+
+def build_layout(screen, journal, layout, shared):
+    for card_class, kwargs in LAYOUTS[layout]:
+        if not shared:
+            # every card parses the TTF again, like before the pool
+            font_pool.clear()
+        card_class(screen, journal, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Card startup benchmark')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    journal = MagicMock()
+    journal.get_race_details.return_value = {
+        "name": "Sample Race",
+        "waypoints": [{"event": "Liftoff", "lat": 0, "lng": 0}, {"event": "Touchdown", "lat": 0, "lng": 1}],
+    }
+
+    for layout in LAYOUTS:
+        for shared in [False, True]:
+            font_pool.clear()
+            loads = font_pool.loads
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                build_layout(screen, journal, layout, shared)
+            elapsed = (time.perf_counter() - start) / args.runs
+            print('{:12} shared={:5} {:.2f}ms per layout, {} font loads'.format(
+                layout, str(shared), elapsed * 1000, font_pool.loads - loads))
+
+
+if __name__ == "__main__":
+    main()
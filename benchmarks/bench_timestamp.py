@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Timestamp parsing during the backfill of a whole session
+
+    python3 -m benchmarks.bench_timestamp --events 200000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from data.journal import JournalEvent, parse_timestamp
+
+
+def session_timestamps(events):
+    """
+    events arrive in bursts that share the same second
+    """
+    random.seed(1)
+    now = datetime(2020, 1, 1)
+    timestamps = []
+    while len(timestamps) < events:
+        now += timedelta(seconds=random.randint(1, 30))
+        stamp = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        timestamps.extend([stamp] * random.randint(1, 20))
+    return timestamps[:events]
+
+
+def measure(func, timestamps):
+    start = time.perf_counter()
+    for t in timestamps:
+        func(t)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Timestamp parsing benchmark')
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--read-ratio', type=float, default=0.1,
+                        help="share of events whose timestamp a card actually reads")
+    args = parser.parse_args()
+
+    timestamps = session_timestamps(args.events)
+    print('{} events, {} distinct seconds'.format(len(timestamps), len(set(timestamps))))
+
+    strptime = measure(lambda t: datetime.strptime(t, '%Y-%m-%dT%H:%M:%SZ'), timestamps)
+    print('strptime:        {:.3f}s'.format(strptime))
+
+    parse_timestamp.cache_clear()
+    sliced = measure(parse_timestamp.__wrapped__, timestamps)
+    print('sliced:          {:.3f}s'.format(sliced))
+
+    parse_timestamp.cache_clear()
+    cached = measure(parse_timestamp, timestamps)
+    print('sliced + cache:  {:.3f}s {}'.format(cached, parse_timestamp.cache_info()))
+
+    parse_timestamp.cache_clear()
+    events = [JournalEvent({"timestamp": t, "event": "Scan"}) for t in timestamps]
+    read = events[::max(1, int(1 / args.read_ratio))] if args.read_ratio > 0 else []
+    start = time.perf_counter()
+    for e in read:
+        e['timestamp']
+    lazy = time.perf_counter() - start
+    print('lazy ({:.0%} read): {:.3f}s'.format(args.read_ratio, lazy))
+
+
+if __name__ == "__main__":
+    main()
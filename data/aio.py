@@ -0,0 +1,202 @@
+import asyncio
+import weakref
+from collections import deque
+
+# put on a queue by close() to wake a consumer waiting in get()
+CLOSED = object()
+
+
+def get_running_loop():
+    # asyncio.get_running_loop is 3.7+, get_event_loop returns the running loop inside a coroutine before that
+    return getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+
+
+async def deliver(queue, backlog, wakeup):
+    """
+    moves one subscription's backlog into its queue, waiting only for that consumer
+    holds no reference to the subscription so an abandoned one can still be collected
+    """
+    while True:
+        while len(backlog) > 0:
+            await queue.put(backlog.popleft())
+        wakeup.clear()
+        await wakeup.wait()
+
+
+class Subscription:
+    """
+    Async iterator over one consumer's queue, closes itself when garbage collected
+    """
+
+    def __init__(self, hub, kind, watch=None, maxsize=100, max_backlog=10000):
+        self.hub = hub
+        self.kind = kind
+        self.watch = None if watch is None else set(watch)
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        # events waiting for room in the queue, the oldest are dropped past max_backlog
+        self.max_backlog = max_backlog
+        self.backlog = deque(maxlen=max_backlog)
+        # events lost because the consumer fell too far behind
+        self.dropped = 0
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        if self.kind == AsyncJournal.EVENTS:
+            self.task = asyncio.ensure_future(deliver(self.queue, self.backlog, self.wakeup))
+            weakref.finalize(self, self.task.cancel)
+
+    def push(self, items):
+        items = list(items)
+        self.dropped += max(0, len(self.backlog) + len(items) - self.max_backlog)
+        self.backlog.extend(items)
+        self.wakeup.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.hub is None and self.queue.empty():
+            raise StopAsyncIteration
+        item = await self.queue.get()
+        if item is CLOSED:
+            raise StopAsyncIteration
+        return item
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.hub is not None:
+            self.hub.unsubscribe(self)
+            self.hub = None
+            if self.task is not None:
+                self.task.cancel()
+            # the consumer is gone, make room for the sentinel
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(CLOSED)
+
+
+class AsyncJournal:
+    """
+    Drives a JournalWatcher from an asyncio loop and fans its data out to subscribers.
+    Do not call refresh() on the watcher yourself while streams are open.
+    """
+    EVENTS = 'events'
+    STATUS = 'status'
+    ROUTE = 'route'
+
+    def __init__(self, journal, interval=0.1, executor=None):
+        self.journal = journal
+        self.interval = interval
+        self.executor = executor
+        self.__subscriptions = weakref.WeakSet()
+        self.__task = None
+        self.__last_status = None
+        self.__last_route = None
+
+    def stream(self, watch=None, maxsize=100, max_backlog=10000):
+        """
+        journal events, a slow consumer only delays its own stream
+        :param watch: event names, None for everything the watcher records
+        :param max_backlog: events held for a slow consumer, older ones are counted in the stream's dropped
+        """
+        if watch is not None:
+            self.journal.watch = list(set(self.journal.watch) | set(watch))
+        return self.__subscribe(Subscription(self, self.EVENTS, watch, maxsize, max_backlog))
+
+    def status_stream(self):
+        """
+        Status.json snapshots, stale ones are replaced by newer ones
+        """
+        subscription = Subscription(self, self.STATUS, maxsize=1)
+        if self.__last_status is not None:
+            subscription.queue.put_nowait(self.__last_status)
+        return self.__subscribe(subscription)
+
+    def route_stream(self):
+        """
+        NavRoute.json contents, stale ones are replaced by newer ones
+        """
+        subscription = Subscription(self, self.ROUTE, maxsize=1)
+        if self.__last_route is not None:
+            subscription.queue.put_nowait(self.__last_route)
+        return self.__subscribe(subscription)
+
+    def __subscribe(self, subscription):
+        self.__subscriptions.add(subscription)
+        subscription.start()
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__pump())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.__subscriptions.discard(subscription)
+
+    async def close(self):
+        """
+        close every stream and stop polling, await before closing the loop
+        """
+        tasks = []
+        for subscription in list(self.__subscriptions):
+            if subscription.task is not None:
+                tasks.append(subscription.task)
+            subscription.close()
+        if self.__task is not None:
+            self.__task.cancel()
+            tasks.append(self.__task)
+            self.__task = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __poll(self):
+        """
+        blocking part, runs in the executor
+        """
+        self.journal.refresh()
+        events = list(self.journal.events)
+
+        status = self.journal.get_status()
+        if status is self.__last_status:
+            status = None
+        else:
+            self.__last_status = status
+
+        route = None
+        if any(s.kind == self.ROUTE for s in list(self.__subscriptions)):
+            # the watcher returns the same list until a complete new route was read
+            route = self.journal.get_route()
+            if route is None or route is self.__last_route:
+                route = None
+            else:
+                self.__last_route = route
+
+        return events, status, route
+
+    async def __pump(self):
+        loop = get_running_loop()
+        while len(self.__subscriptions) > 0:
+            events, status, route = await loop.run_in_executor(self.executor, self.__poll)
+
+            # never awaits, so one full queue can not hold up the other subscriptions
+            for subscription in list(self.__subscriptions):
+                if subscription.hub is None:
+                    continue
+                if subscription.kind == self.EVENTS:
+                    watch = subscription.watch
+                    subscription.push(e for e in events if watch is None or e['event'] in watch)
+                elif subscription.kind == self.STATUS and status is not None:
+                    self.__replace(subscription.queue, status)
+                elif subscription.kind == self.ROUTE and route is not None:
+                    self.__replace(subscription.queue, route)
+
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def __replace(queue, item):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
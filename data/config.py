@@ -31,6 +31,13 @@ class Config(object):
     RACES_DIR = 'races'
     LOGS_DIR = 'logs'
     MAIN_CONFIG = 'config.json'
+    INDEX_FILE = 'journal.sqlite3'
+    TELEMETRY_DIR = 'telemetry'
+    RESULTS_FILE = 'results.sqlite3'
+    STATS_FILE = 'exploration_stats.json'
+    POI_RULES_FILE = 'poi_rules.json'
+    SYSTEMS_FILE = 'systems.sqlite3'
+    STARS_FILE = 'stars.sqlite3'
     CONFIG_ITEMS_MAP = {
         "edsmApiKey": "edsm_api_key"
     }
@@ -88,6 +95,29 @@ class Config(object):
                 if file_field in data:
                     self.__config[class_field] = data[file_field]
 
+    def get_index_path(self):
+        return os.path.join(self.dir, self.INDEX_FILE)
+
+    def get_results_path(self):
+        return os.path.join(self.dir, self.RESULTS_FILE)
+
+    def get_stats_path(self):
+        return os.path.join(self.dir, self.STATS_FILE)
+
+    def get_poi_rules_path(self):
+        return os.path.join(self.dir, self.POI_RULES_FILE)
+
+    def get_systems_path(self):
+        return os.path.join(self.dir, self.SYSTEMS_FILE)
+
+    def get_stars_path(self):
+        return os.path.join(self.dir, self.STARS_FILE)
+
+    def get_telemetry_dir(self):
+        telemetry_dir = os.path.join(self.dir, self.TELEMETRY_DIR)
+        os.makedirs(telemetry_dir, exist_ok=True)
+        return telemetry_dir
+
     def select_race(self, name):
         self.selected_race = name
 
@@ -0,0 +1,101 @@
+"""
+Great-circle distances and bearings on a sphere, batched over many points.
+Uses NumPy when it is installed and plain python otherwise.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# m, used when the status has no PlanetRadius
+DEFAULT_RADIUS = 6371000
+
+
+def central_angle(a, b):
+    """
+    :param a: (lat, lng) in degrees
+    :param b: (lat, lng) in degrees
+    :return: angle between a and b in radians
+    """
+    lat1, lng1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lng2 = math.radians(b[0]), math.radians(b[1])
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * math.asin(min(1.0, math.sqrt(h)))
+
+
+def distance_km(a, b, radius=DEFAULT_RADIUS):
+    """
+    :param radius: planet radius in m
+    """
+    return central_angle(a, b) * radius / 1000
+
+
+def bearing(a, b):
+    """
+    :return: initial heading from a to b in degrees, 0 is north
+    """
+    lat1, lng1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lng2 = math.radians(b[0]), math.radians(b[1])
+    d_lng = lng2 - lng1
+    y = math.sin(d_lng) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lng)
+    return math.degrees(math.atan2(y, x)) % 360
+
+
+def distances_km(origin, points, radius=DEFAULT_RADIUS):
+    """
+    :param points: sequence of (lat, lng)
+    :return: distance from origin to every point
+    """
+    if len(points) == 0:
+        return []
+    if np is None:
+        return [distance_km(origin, p, radius) for p in points]
+
+    points = np.radians(np.asarray(points, dtype=float))
+    lat1, lng1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lng2 = points[:, 0], points[:, 1]
+    h = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return (2 * np.arcsin(np.minimum(1.0, np.sqrt(h))) * radius / 1000).tolist()
+
+
+def bearings(origin, points):
+    """
+    :return: initial heading from origin to every point
+    """
+    if len(points) == 0:
+        return []
+    if np is None:
+        return [bearing(origin, p) for p in points]
+
+    points = np.radians(np.asarray(points, dtype=float))
+    lat1, lng1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lng2 = points[:, 0], points[:, 1]
+    d_lng = lng2 - lng1
+    y = np.sin(d_lng) * np.cos(lat2)
+    x = math.cos(lat1) * np.sin(lat2) - math.sin(lat1) * np.cos(lat2) * np.cos(d_lng)
+    return (np.degrees(np.arctan2(y, x)) % 360).tolist()
+
+
+def nearest(origin, points, radius=DEFAULT_RADIUS):
+    """
+    :return: (index, distance in km) of the closest point, (-1, None) if there are none
+    """
+    distances = distances_km(origin, points, radius)
+    if len(distances) == 0:
+        return -1, None
+    index = min(range(len(distances)), key=distances.__getitem__)
+    return index, distances[index]
+
+
+def within_range(origin, points, range_km, radius=DEFAULT_RADIUS):
+    """
+    :param range_km: one range for all points or one per point
+    :return: indexes of the points that are in range
+    """
+    distances = distances_km(origin, points, radius)
+    if isinstance(range_km, (int, float)):
+        range_km = [range_km] * len(distances)
+    return [i for i, (d, r) in enumerate(zip(distances, range_km)) if d <= r]
@@ -0,0 +1,206 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from data.config import Config, get_config_dir
+from data.journal import JournalEvent, PATTERN_JOURNAL
+from data.tail import FileTail
+
+
+class JournalIndex:
+    """
+    SQLite index of every journal in a directory, updated incrementally by byte offset
+    """
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS files ('
+        ' name TEXT PRIMARY KEY, offset INTEGER NOT NULL, inode INTEGER)',
+        'CREATE TABLE IF NOT EXISTS events ('
+        ' id INTEGER PRIMARY KEY, file TEXT NOT NULL, event TEXT NOT NULL, timestamp TEXT,'
+        ' star_system TEXT, system_address INTEGER, data TEXT NOT NULL, offset INTEGER)',
+        'CREATE INDEX IF NOT EXISTS events_event ON events (event, timestamp)',
+        'CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp)',
+        'CREATE INDEX IF NOT EXISTS events_star_system ON events (star_system)',
+        'CREATE INDEX IF NOT EXISTS events_system_address ON events (system_address)',
+        'CREATE INDEX IF NOT EXISTS events_file ON events (file, offset)',
+    ]
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.connection.close()
+
+    def __get_file_state(self, name):
+        row = self.connection.execute('SELECT offset, inode FROM files WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return 0, None
+        return row
+
+    def update(self, directory, stopped=None):
+        """
+        index everything appended since the last update
+        :param stopped: threading.Event checked between files, the files done so far stay indexed
+        :return: number of new events
+        """
+        count = 0
+        files = sorted(f for f in os.listdir(directory) if PATTERN_JOURNAL.match(f))
+        for name in files:
+            if stopped is not None and stopped.is_set():
+                break
+            count += self.__update_file(directory, name)
+        return count
+
+    def __update_file(self, directory, name):
+        path = os.path.join(directory, name)
+        offset, inode = self.__get_file_state(name)
+        file_stat = os.stat(path)
+
+        if file_stat.st_size == offset and file_stat.st_ino == inode:
+            return 0
+
+        rows = []
+        with self.connection:
+            # replaced or truncated, index again from the start
+            if (inode is not None and file_stat.st_ino != inode) or file_stat.st_size < offset:
+                self.connection.execute('DELETE FROM events WHERE file = ?', (name,))
+                offset = 0
+
+            tail = FileTail(path, offset=offset, inode=file_stat.st_ino)
+            for line, line_end in tail.read_entries():
+                try:
+                    text = line.decode('utf-8')
+                    e = json.loads(text)
+                except ValueError:
+                    continue
+                if not isinstance(e, dict) or 'event' not in e:
+                    continue
+                rows.append((
+                    name,
+                    e['event'],
+                    e.get('timestamp'),
+                    e.get('StarSystem'),
+                    e.get('SystemAddress'),
+                    text,
+                    line_end,
+                ))
+
+            self.connection.executemany(
+                'INSERT INTO events (file, event, timestamp, star_system, system_address, data, offset)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            # a torn last line is read again next time
+            self.connection.execute(
+                'INSERT OR REPLACE INTO files (name, offset, inode) VALUES (?, ?, ?)',
+                (name, tail.offset - len(tail.pending), tail.inode))
+
+        return len(rows)
+
+    @staticmethod
+    def __where(event=None, since=None, until=None, star_system=None, system_address=None, after_id=None):
+        clauses = []
+        params = []
+        if after_id is not None:
+            clauses.append('id > ?')
+            params.append(after_id)
+        if event is not None:
+            if isinstance(event, str):
+                event = [event]
+            clauses.append('event IN ({})'.format(",".join("?" * len(event))))
+            params.extend(event)
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('timestamp < ?')
+            params.append(until)
+        if star_system is not None:
+            clauses.append('star_system = ?')
+            params.append(star_system)
+        if system_address is not None:
+            clauses.append('system_address = ?')
+            params.append(system_address)
+
+        if len(clauses) == 0:
+            return '', params
+        return ' WHERE ' + ' AND '.join(clauses), params
+
+    def query(self, limit=None, **filters):
+        """
+        :param filters: event (name or list), since, until (journal timestamp strings), star_system, system_address,
+            after_id (last id already seen)
+        :return: matching events, old to new, with their source file and offset
+        """
+        where, params = self.__where(**filters)
+        sql = 'SELECT data, file, offset FROM events' + where + ' ORDER BY timestamp, id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [JournalEvent(json.loads(data), source=(file, offset))
+                for data, file, offset in self.connection.execute(sql, params)]
+
+    def get_last_id(self):
+        """
+        :return: id of the newest indexed event, 0 if there is none
+        """
+        return self.connection.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+
+    def count(self, **filters):
+        where, params = self.__where(**filters)
+        return self.connection.execute('SELECT COUNT(*) FROM events' + where, params).fetchone()[0]
+
+
+class IndexUpdater(threading.Thread):
+    """
+    Brings a JournalIndex up to date away from the render loop, with its own connection
+    """
+
+    def __init__(self, path, directory, on_done=None):
+        """
+        :param on_done: called on this thread with the updated JournalIndex, unless stopped before
+        """
+        super(IndexUpdater, self).__init__(daemon=True)
+        self.path = path
+        self.directory = directory
+        self.on_done = on_done
+        self.count = None
+        # exception that stopped the update, raised again by the card waiting for it
+        self.error = None
+        # set once on_done returned or the update failed
+        self.is_done = False
+        self.__stopped = threading.Event()
+
+    def run(self):
+        index = JournalIndex(self.path)
+        try:
+            self.count = index.update(self.directory, stopped=self.__stopped)
+            print('Indexed {} new journal events'.format(self.count))
+            if self.on_done is not None and not self.__stopped.is_set():
+                self.on_done(index)
+        except Exception as e:
+            logging.exception('Journal index update failed: {}'.format(e))
+            self.error = e
+        finally:
+            index.close()
+            self.is_done = True
+
+    def close(self):
+        self.__stopped.set()
+        if self.is_alive():
+            self.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Index all journals')
+    parser.add_argument('--dir', '-d', type=str, default=get_config_dir(), help="path to journal directory")
+    parser.add_argument('--config', '-c', type=str, default='', help="config path")
+    args = parser.parse_args()
+
+    config = Config(config_dir=args.config) if args.config else Config()
+    index = JournalIndex(config.get_index_path())
+    print('Indexed {} new events'.format(index.update(args.dir)))
+    index.close()
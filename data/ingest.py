@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from data.journal import EventBus
+from data.motion import MotionModel
+from data.route import RouteIndex
+
+
+class JournalWorker(threading.Thread):
+    """
+    Owns a JournalWatcher and does all the file I/O away from the render loop
+    """
+
+    def __init__(self, journal, interval=1 / 60, max_batches=64, max_pending=10000):
+        super(JournalWorker, self).__init__(daemon=True)
+        self.journal = journal
+        self.interval = interval
+        self.max_batches = max_batches
+        # events held back while the render loop is behind, the oldest are dropped past this
+        self.max_pending = max_pending
+        self.dropped = 0
+        # deque append and popleft are atomic, the render loop never waits on the worker
+        self.batches = deque()
+        # latest status snapshot, its version and arrival time, replaced as a whole
+        self.status = (None, 0, None)
+        # parsed NavRoute.json and its RouteIndex, replaced as a whole
+        self.route = (None, RouteIndex([]))
+        # exception that stopped the worker, raised again on the render loop
+        self.error = None
+        self.__stopped = threading.Event()
+
+    def run(self):
+        try:
+            self.__run()
+        except Exception as e:
+            logging.exception('Journal worker stopped: {}'.format(e))
+            self.error = e
+
+    def __run(self):
+        pending = []
+        while not self.__stopped.is_set():
+            self.journal.refresh()
+            if self.journal.status_version != self.status[1]:
+                self.status = (self.journal.get_status(), self.journal.status_version, time.monotonic())
+
+            route = self.journal.get_route()
+            if route is not self.route[0]:
+                self.route = (route, self.journal.get_route_index())
+
+            pending.extend(self.journal.events)
+            if len(pending) > self.max_pending:
+                self.dropped += len(pending) - self.max_pending
+                del pending[:len(pending) - self.max_pending]
+            # keep accumulating while the render loop is behind
+            if len(pending) > 0 and len(self.batches) < self.max_batches:
+                self.batches.append(pending)
+                pending = []
+
+            self.__stopped.wait(self.interval)
+
+    def stop(self):
+        self.__stopped.set()
+        if self.is_alive():
+            self.join()
+
+
+class ThreadedJournal:
+    """
+    Render side of the worker, same interface as JournalWatcher for the cards
+    """
+    is_modified = False
+
+    def __init__(self, journal, **kwargs):
+        self.journal = journal
+        self.config = journal.config
+        self.worker = JournalWorker(journal, **kwargs)
+        self.bus = EventBus()
+        self.__events = []
+        self.__status = None
+        self.status_version = 0
+        self.motion = MotionModel()
+
+    @property
+    def watch(self):
+        return self.journal.watch
+
+    @watch.setter
+    def watch(self, value):
+        self.journal.watch = value
+
+    @property
+    def commander(self):
+        return self.journal.commander
+
+    def include_pass_event(self):
+        self.journal.include_pass_event()
+
+    def start(self):
+        self.worker.start()
+
+    def stop(self):
+        self.worker.stop()
+
+    def refresh(self):
+        if self.worker.error is not None:
+            raise self.worker.error
+        events = []
+        while True:
+            try:
+                events.extend(self.worker.batches.popleft())
+            except IndexError:
+                break
+        self.__events = events
+        status, status_version, arrived = self.worker.status
+        if status_version != self.status_version:
+            self.motion.add_status(arrived, status)
+        self.__status, self.status_version = status, status_version
+        self.is_modified = len(events) > 0
+        self.bus.dispatch(events)
+        return self.is_modified
+
+    def get_route(self):
+        return self.worker.route[0]
+
+    def get_route_index(self):
+        return self.worker.route[1]
+
+    def get_status(self):
+        return self.__status
+
+    def get_predicted_position(self, t=None):
+        return self.motion.position_at(time.monotonic() if t is None else t)
+
+    def get_race_details(self):
+        return self.config.get_race_details()
+
+    @property
+    def events(self):
+        return self.__events
+
+    def now(self):
+        return datetime.now()
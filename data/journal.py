@@ -1,27 +1,182 @@
-import time
 import os
 import re
+import time
 import json
 from datetime import datetime
+from functools import lru_cache
+from collections import OrderedDict
 from data.config import Config
+from data.tail import FileTail
+from data.notify import create_notifier
+from data.aio import AsyncJournal
+from data.status import StatusReader
+from data.route import RouteIndex
+from data.motion import MotionModel
+
+PATTERN_JOURNAL = re.compile(r'Journal\.(\d+)\.\d+\.log')
+# always decoded to know who is playing
+COMMANDER_EVENTS = frozenset(['Commander', 'LoadGame'])
+
+
+def peek_event_name(line):
+    """
+    read the event name of a raw journal line without decoding the whole line
+    :param line: bytes
+    :return: event name or None if it could not be found
+    """
+    key = line.find(b'"event"')
+    if key < 0:
+        return None
+    start = line.find(b'"', key + 7)
+    if start < 0 or line[key + 7:start].strip() != b':':
+        return None
+    end = line.find(b'"', start + 1)
+    if end < 0:
+        return None
+    return line[start + 1:end].decode('utf-8', 'replace')
+
+
+@lru_cache(maxsize=256)
+def parse_timestamp(timestamp_string):
+    """
+    parse the fixed journal format %Y-%m-%dT%H:%M:%SZ by slicing, events in a burst share the cached result
+    """
+    s = timestamp_string
+    if len(s) == 20 and s[4] == '-' and s[7] == '-' and s[10] == 'T' and s[13] == ':' and s[16] == ':' \
+            and s[19] == 'Z':
+        try:
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]))
+        except ValueError:
+            pass
+    return datetime.strptime(s, '%Y-%m-%dT%H:%M:%SZ')
+
+
+class JournalEvent(dict):
+    """
+    journal entry that converts its timestamp only when it is read,
+    every way of reading the contents sees the converted value
+    """
+    # (journal file name, byte offset after the line) the event was read from, None if unknown
+    source = None
+
+    def __init__(self, *args, source=None, **kwargs):
+        super(JournalEvent, self).__init__(*args, **kwargs)
+        if source is not None:
+            self.source = source
+
+    def __resolve(self):
+        value = dict.get(self, 'timestamp')
+        if isinstance(value, str):
+            value = parse_timestamp(value)
+            dict.__setitem__(self, 'timestamp', value)
+        return value
+
+    def __getitem__(self, key):
+        if key == 'timestamp':
+            self.__resolve()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        if key == 'timestamp':
+            self.__resolve()
+        return dict.pop(self, key, *default)
+
+    # a dict subclass with its own __iter__ makes dict(e) go through keys() and __getitem__
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        self.__resolve()
+        return dict.items(self)
+
+    def values(self):
+        self.__resolve()
+        return dict.values(self)
+
+    def copy(self):
+        self.__resolve()
+        return JournalEvent(dict.items(self), source=self.source)
+
+    def __eq__(self, other):
+        self.__resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self.__resolve()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self.__resolve()
+        return dict.__repr__(self)
+
+
+class EventBus:
+    """
+    Routes each event only to the handlers that subscribed to its name
+    """
+
+    def __init__(self):
+        self.__handlers = {}
+
+    @property
+    def watched(self):
+        return list(self.__handlers.keys())
+
+    def subscribe(self, events, handler):
+        for name in events:
+            handlers = self.__handlers.setdefault(name, [])
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unsubscribe(self, handler):
+        for handlers in self.__handlers.values():
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def dispatch(self, events):
+        """
+        each handler is called once with its events, in journal order
+        """
+        batches = OrderedDict()
+        for e in events:
+            for handler in self.__handlers.get(e['event'], ()):
+                if handler not in batches:
+                    batches[handler] = []
+                batches[handler].append(e)
+
+        for handler, batch in batches.items():
+            handler(batch)
 
 
 class JournalWatcher:
     is_modified = False
-    def __init__(self, directory=None, watch=None, config=None):
+    def __init__(self, directory=None, watch=None, config=None, notifier=None):
         self.directory = directory
-        # track file last update
-        self.last_update = None
-        self.last_status_update = None
-        # last line in file
-        self.last_line = None
-        # last filename
-        self.last_filename = None
+        # change notification backend, created on first refresh
+        self.notifier = notifier
+        self.__status_changed = True
+        self.__status_reader = None
+        self.__route_key = None
+        self.__route = None
+        self.__route_index = None
+        self.motion = MotionModel()
+        # byte offset readers per journal part
+        self.__tails = {}
+        # parts that were rolled over and are no longer written to
+        self.__finished = set()
         self.__events = []
-        self.__status = None
-        self.__last_status = None
         self.is_include_pass_event = False
         self.has_new_status = False
+        self.commander = None
+        self.__async = None
+        self.bus = EventBus()
 
         if watch is None:
             self.watch = []
@@ -42,135 +197,204 @@ class JournalWatcher:
         :return: sorted by old to new
         """
         # get all journal files
-        pattern_journals = re.compile('Journal\.(\d+)\.\d+\.log')
+        pattern_journals = PATTERN_JOURNAL
         file_list = os.listdir(self.directory)
         journal_files = list(filter(lambda s: pattern_journals.match(s), file_list))
         # get latest journal
         timestamps = map(lambda s: int(pattern_journals.match(s)[1]), journal_files)
         max_timestamp = max(timestamps)
         # get all latest file
-        pattern_latest = re.compile('Journal\.{}\.\d+\.log'.format(max_timestamp))
+        pattern_latest = re.compile(r'Journal\.{}\.\d+\.log'.format(max_timestamp))
         return sorted(filter(lambda s: pattern_latest.match(s), journal_files))
 
-    def __journal_event_generator(self, files):
+    def __get_tail(self, filename):
+        if filename not in self.__tails:
+            self.__tails[filename] = FileTail(os.path.join(self.directory, filename))
+        return self.__tails[filename]
 
+    def __journal_event_generator(self, files, watched=None):
+        """
+        :param watched: only decode these events, None for all
+        :return: (decoded entry, file name, offset after the line), entry is None for skipped lines
+        """
         for filename in files:
-
-            if self.last_filename != filename:
-                self.last_filename = filename
-                self.last_line = 0
-
-            full_path = os.path.join(self.directory, filename)
-            file_stat = os.stat(os.path.join(self.directory, full_path))
-            # if self.last_update is not None and file_stat.st_mtime < self.last_update:
-            #     continue
-
-            with open(full_path, 'r') as fp:
-                current_file_line = 0
-                while True:
-                    line = fp.readline()
-                    current_file_line += 1
-
-                    if self.last_line > current_file_line:
+            for line, offset in self.__get_tail(filename).read_entries():
+                if watched is not None:
+                    event_name = peek_event_name(line)
+                    if event_name is not None and event_name not in watched:
+                        yield None, filename, offset
                         continue
-
-                    if not line:
-                        break
-
-                    try:
-                        decoded = json.loads(line)
-                        yield decoded
-                    except json.decoder.JSONDecodeError:
-                        pass
-
-                self.last_line = current_file_line
-
-    def __parse_timestamp(self, timestamp_string):
-        return datetime.strptime(timestamp_string, '%Y-%m-%dT%H:%M:%SZ')
+                try:
+                    # json.loads only accepts bytes since Python 3.6
+                    yield json.loads(line.decode('utf-8')), filename, offset
+                except ValueError:
+                    pass
 
     def __encode_timestamp(self, now):
         return now.strftime('%Y-%m-%dT%H:%M:%SZ')
 
     def __extract(self, file):
-        for e in self.__journal_event_generator([file]):
-            event_name = e['event']
-
-            if 'timestamp' in e:
-                e['timestamp'] = self.__parse_timestamp(e['timestamp'])
+        """
+        :return: number of journal entries read
+        """
+        count = 0
+        watched = set(self.watch)
+        for e, filename, offset in self.__journal_event_generator([file], watched | COMMANDER_EVENTS):
+            count += 1
+            if e is None:
+                continue
+            if e['event'] in COMMANDER_EVENTS:
+                self.commander = e.get('Name', e.get('Commander'))
             # record events
-            if event_name in self.watch:
-                self.__events.append(e)
+            if e['event'] in watched:
+                self.__events.append(JournalEvent(e, source=(filename, offset)))
+        return count
 
     def refresh(self):
         self.is_modified = False
+        self.has_new_status = False
         self.__events = []
-        files = self.__get_journal_files()
-        if len(files) > 0:
-            for file in files:
-                last_file_stat = os.stat(os.path.join(self.directory, file))
-                if self.last_update is None or last_file_stat.st_mtime > self.last_update:
-                    self.__extract(file)
-                    self.last_update = last_file_stat.st_mtime
-                    self.is_modified = True
+
+        if self.notifier is None:
+            self.notifier = create_notifier(self.directory)
+        changed = self.notifier.poll()
+
+        if changed is None or 'status.json' in changed:
+            self.__status_changed = True
+        self.__poll_status()
+
+        if changed is None or any(name.startswith('journal.') for name in changed):
+            self.__refresh_journal()
 
         if self.is_include_pass_event:
-            self.get_status()
+            self.__append_pass_event()
 
-            if len(self.__events) > 0:
-                timestamp = self.__events[-1]['timestamp']
-            else:
-                timestamp = datetime.utcnow()
+        self.bus.dispatch(self.__events)
 
-            if self.has_new_status:
-                self.__events.append({
-                    "timestamp": timestamp,
-                    "event": "Pass",
-                })
+        return self.is_modified
+
+    def __refresh_journal(self):
+        files = self.__get_journal_files()
+
+        # forget parts of older sessions
+        for filename in list(self.__tails.keys()):
+            if filename not in files:
+                del self.__tails[filename]
+                self.__finished.discard(filename)
+
+        for index, file in enumerate(files):
+            if file in self.__finished:
+                continue
+            if self.__extract(file) > 0:
                 self.is_modified = True
+            # a newer part exists so this one is complete
+            if index < len(files) - 1:
+                self.__finished.add(file)
 
-        return self.is_modified
+    def __append_pass_event(self):
+        if len(self.__events) > 0:
+            timestamp = self.__events[-1]['timestamp']
+        else:
+            timestamp = datetime.utcnow()
+
+        if self.has_new_status:
+            self.__events.append({
+                "timestamp": timestamp,
+                "event": "Pass",
+            })
+            self.is_modified = True
 
     def get_route(self):
+        """
+        parsed NavRoute.json, only read again when its mtime or size changes
+        """
         path = os.path.join(self.directory, 'NavRoute.json')
 
-        if not os.path.isfile(path):
+        try:
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            self.__route_key = None
+            self.__route = None
+            self.__route_index = None
             return None
 
-        route = None
-        with open(path, 'r') as file:
-            route = json.load(file)
-
-        if 'Route' not in route:
-            return []
+        route_key = (file_stat.st_mtime, file_stat.st_size)
+        if route_key == self.__route_key:
+            return self.__route
 
-        return route['Route']
+        try:
+            with open(path, 'r') as file:
+                route = json.load(file)
+        except ValueError:
+            # half written, keep the previous route until it is complete
+            return self.__route
+
+        self.__route_key = route_key
+        self.__route = route.get('Route', [])
+        self.__route_index = RouteIndex(self.__route)
+        return self.__route
+
+    def get_route_index(self):
+        """
+        :return: RouteIndex of the current route, empty if there is none
+        """
+        if self.get_route() is None:
+            return RouteIndex([])
+        return self.__route_index
+
+    def __get_status_reader(self):
+        if self.__status_reader is None:
+            self.__status_reader = StatusReader(os.path.join(self.directory, 'status.json'))
+        return self.__status_reader
+
+    def __poll_status(self):
+        reader = self.__get_status_reader()
+        if self.__status_changed or reader.is_torn:
+            self.__status_changed = False
+            self.has_new_status = reader.poll()
+            if self.has_new_status:
+                self.motion.add_status(time.monotonic(), reader.status)
 
     def get_status(self):
-        file = "status.json"
-        file_path = os.path.join(self.directory, file)
-        try:
-            last_file_stat = os.stat(file_path)
-        except FileNotFoundError:
-            return None
-        self.has_new_status = False
-        if self.last_status_update is None or last_file_stat.st_mtime > self.last_status_update:
-            for _ in range(10):
-                try:
-                    with open(file_path, 'r') as fp:
-                        tmp = self.__status
-                        self.__status = json.load(fp)
-                        self.__last_status = tmp
-                    self.last_status_update = last_file_stat.st_mtime
-                    self.has_new_status = True
-                    break
-                except json.decoder.JSONDecodeError:
-                    time.sleep(0.1)
-
-        return self.__status
+        """
+        last good snapshot, only refresh() touches the file
+        """
+        if self.__status_changed and self.__status_reader is None:
+            self.__poll_status()
+        return self.__get_status_reader().status
+
+    def get_predicted_position(self, t=None):
+        """
+        ship position estimated for the render time
+        :param t: time.monotonic() value, defaults to now
+        :return: (lat, lng, alt) or None
+        """
+        return self.motion.position_at(time.monotonic() if t is None else t)
+
+    @property
+    def status_version(self):
+        return self.__get_status_reader().version
 
     def get_race_details(self):
         return self.config.get_race_details()
 
+    def get_async(self):
+        """
+        asyncio front end, use instead of refresh()
+        """
+        if self.__async is None:
+            self.__async = AsyncJournal(self)
+        return self.__async
+
+    def stream(self, watch=None, maxsize=100, max_backlog=10000):
+        return self.get_async().stream(watch=watch, maxsize=maxsize, max_backlog=max_backlog)
+
+    def status_stream(self):
+        return self.get_async().status_stream()
+
+    def route_stream(self):
+        return self.get_async().route_stream()
+
     @property
     def events(self):
         return self.__events
@@ -0,0 +1,86 @@
+from collections import deque
+
+
+def wrap_longitude(lng):
+    return (lng + 180) % 360 - 180
+
+
+class MotionModel:
+    """
+    Estimates the ship position between Status.json updates from its recent samples
+    """
+
+    def __init__(self, history=4, max_extrapolation=1.0):
+        # (time, lat, lng, alt)
+        self.samples = deque(maxlen=history)
+        # seconds past the last sample a position is projected
+        self.max_extrapolation = max_extrapolation
+        self.body_name = None
+
+    def clear(self):
+        self.samples.clear()
+
+    def add(self, t, lat, lng, alt=None):
+        """
+        :param t: arrival time in seconds, monotonic
+        """
+        if len(self.samples) > 0 and t <= self.samples[-1][0]:
+            self.samples.pop()
+        self.samples.append((t, lat, lng, alt))
+
+    def add_status(self, t, status):
+        """
+        add a Status.json snapshot, samples from another body are not mixed
+        """
+        if not status:
+            return
+        lat = status.get('Latitude')
+        lng = status.get('Longitude')
+        if lat is None or lng is None:
+            self.clear()
+            return
+        if status.get('BodyName') != self.body_name:
+            self.body_name = status.get('BodyName')
+            self.clear()
+        self.add(t, lat, lng, status.get('Altitude'))
+
+    def get_velocity(self):
+        """
+        :return: (lat, lng, alt) change per second over the sample window
+        """
+        if len(self.samples) < 2:
+            return 0.0, 0.0, 0.0
+        t0, lat0, lng0, alt0 = self.samples[0]
+        t1, lat1, lng1, alt1 = self.samples[-1]
+        dt = t1 - t0
+        alt_speed = 0.0 if alt0 is None or alt1 is None else (alt1 - alt0) / dt
+        return (lat1 - lat0) / dt, wrap_longitude(lng1 - lng0) / dt, alt_speed
+
+    def position_at(self, t):
+        """
+        interpolated between samples, extrapolated a short time past the last one
+        :return: (lat, lng, alt), None without samples
+        """
+        if len(self.samples) == 0:
+            return None
+
+        last_t, lat, lng, alt = self.samples[-1]
+        if t >= last_t:
+            dt = min(t - last_t, self.max_extrapolation)
+            v_lat, v_lng, v_alt = self.get_velocity()
+            if alt is not None:
+                alt += v_alt * dt
+            return max(-90.0, min(90.0, lat + v_lat * dt)), wrap_longitude(lng + v_lng * dt), alt
+
+        previous = None
+        for sample in self.samples:
+            if sample[0] > t:
+                if previous is None:
+                    return sample[1], sample[2], sample[3]
+                t0, lat0, lng0, alt0 = previous
+                t1, lat1, lng1, alt1 = sample
+                ratio = (t - t0) / (t1 - t0)
+                if alt0 is not None and alt1 is not None:
+                    alt0 += (alt1 - alt0) * ratio
+                return lat0 + (lat1 - lat0) * ratio, wrap_longitude(lng0 + wrap_longitude(lng1 - lng0) * ratio), alt0
+            previous = sample
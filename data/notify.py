@@ -0,0 +1,125 @@
+import os
+import re
+import struct
+import platform
+import ctypes
+import ctypes.util
+
+# files in the journal directory that the watcher reads
+PATTERN_WATCHED = re.compile(r'^(journal\.\d+\.\d+\.log|status\.json|navroute\.json)$')
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingNotifier:
+    """
+    Fallback backend, cannot tell what changed so every file is checked
+    """
+
+    def poll(self):
+        """
+        :return: None, meaning the caller has to stat everything
+        """
+        return None
+
+    def fileno(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class InotifyNotifier:
+    """
+    Linux backend, reports writes to the journal directory through inotify
+    """
+
+    def __init__(self, directory):
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify not supported")
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch failed", directory)
+
+        # nothing is known about the files until the first full scan
+        self.is_synced = False
+
+    def poll(self):
+        """
+        :return: set of lower cased names of changed files, None if everything has to be checked
+        """
+        changed = set()
+        overflow = not self.is_synced
+        self.is_synced = True
+
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+
+                name = os.fsdecode(name).lower()
+                if PATTERN_WATCHED.match(name):
+                    changed.add(name)
+
+        if overflow:
+            return None
+        return changed
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def create_notifier(directory, backend=None):
+    """
+    :param backend: 'inotify', 'polling' or None to pick the best available
+    """
+    if backend == 'polling':
+        return PollingNotifier()
+
+    if backend == 'inotify' or (backend is None and platform.system().lower() == 'linux'):
+        try:
+            return InotifyNotifier(directory)
+        except OSError:
+            if backend == 'inotify':
+                raise
+
+    return PollingNotifier()
@@ -0,0 +1,93 @@
+import sqlite3
+
+
+class RaceResults:
+    """
+    Finished runs and their split times per race file and commander
+    """
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS runs ('
+        ' id INTEGER PRIMARY KEY, race TEXT NOT NULL, commander TEXT NOT NULL,'
+        ' started TEXT NOT NULL, total REAL NOT NULL)',
+        # split is the time in seconds from the start to the gate
+        'CREATE TABLE IF NOT EXISTS splits ('
+        ' run_id INTEGER NOT NULL REFERENCES runs (id), gate INTEGER NOT NULL, split REAL NOT NULL,'
+        ' PRIMARY KEY (run_id, gate))',
+        'CREATE INDEX IF NOT EXISTS runs_best ON runs (race, commander, total)',
+        'CREATE INDEX IF NOT EXISTS splits_best ON splits (gate, split)',
+    ]
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+        # (race, commander) -> splits of the best run, so deltas never hit the database
+        self.__best = {}
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, race, commander, started, splits):
+        """
+        :param started: start of the run as datetime
+        :param splits: seconds from the start for every gate, the last one is the total
+        :return: id of the new run
+        """
+        # loaded before the new run is stored so it is compared to the previous best
+        best = self.get_best_lap(race, commander)
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (race, commander, started, total) VALUES (?, ?, ?, ?)',
+                (race, commander, started.isoformat(), splits[-1]))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO splits (run_id, gate, split) VALUES (?, ?, ?)',
+                [(run_id, gate, split) for gate, split in enumerate(splits)])
+
+        if len(best) == 0 or splits[-1] < best[-1]:
+            self.__best[(race, commander)] = list(splits)
+        return run_id
+
+    def get_best_lap(self, race, commander):
+        """
+        :return: splits of the fastest run, empty if there is none
+        """
+        key = (race, commander)
+        if key not in self.__best:
+            row = self.connection.execute(
+                'SELECT id FROM runs WHERE race = ? AND commander = ? ORDER BY total LIMIT 1',
+                (race, commander)).fetchone()
+            splits = []
+            if row is not None:
+                splits = [split for split, in self.connection.execute(
+                    'SELECT split FROM splits WHERE run_id = ? ORDER BY gate', (row[0],))]
+            self.__best[key] = splits
+        return self.__best[key]
+
+    def get_delta(self, race, commander, gate, split):
+        """
+        :return: seconds ahead (negative) or behind the best run at the gate, None without one
+        """
+        best = self.get_best_lap(race, commander)
+        if gate >= len(best):
+            return None
+        return split - best[gate]
+
+    def get_best_splits(self, race, commander):
+        """
+        :return: fastest time to every gate over all runs
+        """
+        return [split for split, in self.connection.execute(
+            'SELECT MIN(s.split) FROM splits s JOIN runs r ON r.id = s.run_id'
+            ' WHERE r.race = ? AND r.commander = ? GROUP BY s.gate ORDER BY s.gate',
+            (race, commander))]
+
+    def get_leaderboard(self, race, limit=10):
+        """
+        :return: (commander, best total) fastest first
+        """
+        return self.connection.execute(
+            'SELECT commander, MIN(total) AS best FROM runs WHERE race = ?'
+            ' GROUP BY commander ORDER BY best LIMIT ?', (race, limit)).fetchall()
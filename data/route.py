@@ -0,0 +1,54 @@
+import math
+
+
+class RouteIndex:
+    """
+    Position lookup and cumulative jump distances of a plotted route
+    """
+
+    def __init__(self, route):
+        self.route = route
+        # SystemAddress -> first position in the route
+        self.positions = {}
+        # distance in ly from the start of the route to each stop
+        self.distances = []
+
+        total = 0.0
+        last_pos = None
+        for index, stop in enumerate(route):
+            if 'SystemAddress' in stop:
+                self.positions.setdefault(stop['SystemAddress'], index)
+
+            star_pos = stop.get('StarPos')
+            if last_pos is not None and star_pos is not None:
+                total += self.get_distance(last_pos, star_pos)
+            if star_pos is not None:
+                last_pos = star_pos
+            self.distances.append(total)
+
+    def __len__(self):
+        return len(self.route)
+
+    @staticmethod
+    def get_distance(a, b):
+        return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+    def index_of(self, system_address):
+        """
+        :return: position in the route, -1 if not in the route
+        """
+        return self.positions.get(system_address, -1)
+
+    @property
+    def total_distance(self):
+        if len(self.distances) == 0:
+            return 0.0
+        return self.distances[-1]
+
+    def distance_between(self, start, end):
+        return self.distances[end] - self.distances[start]
+
+    def remaining_distance(self, position):
+        if position < 0 or position >= len(self.distances):
+            return self.total_distance
+        return self.total_distance - self.distances[position]
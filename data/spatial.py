@@ -0,0 +1,240 @@
+import heapq
+import math
+import queue
+import threading
+from array import array
+from collections import OrderedDict
+from data.route import RouteIndex
+from data.stars import StarDatabase
+
+
+class SpatialIndex:
+    """
+    Nearest system and radius queries over star coordinates, using an implicit KD-tree
+    """
+
+    def __init__(self, max_pending=32):
+        # coordinates in ly, one entry per system in insertion order
+        self.xs = array('d')
+        self.ys = array('d')
+        self.zs = array('d')
+        self.systems = []
+        self.__positions = {}
+        # point indexes laid out so that the median of every range is the node splitting it
+        self.__tree = []
+        # added since the last build, scanned linearly until the next one so kept small
+        self.__pending = []
+        self.max_pending = max_pending
+
+    def __len__(self):
+        return len(self.systems)
+
+    def add(self, address, name, star_pos, star_class=None):
+        """
+        :return: True if the system was not known yet
+        """
+        if not self.__insert(address, name, star_pos, star_class):
+            return False
+        if len(self.__pending) > self.max_pending:
+            self.rebuild()
+        return True
+
+    def __insert(self, address, name, star_pos, star_class):
+        if address in self.__positions:
+            system = self.systems[self.__positions[address]]
+            if star_class is not None:
+                system['StarClass'] = star_class
+            return False
+
+        self.__positions[address] = len(self.systems)
+        self.__pending.append(len(self.systems))
+        self.systems.append({
+            'SystemAddress': address,
+            'StarSystem': name,
+            'StarPos': list(star_pos),
+            'StarClass': star_class,
+        })
+        self.xs.append(star_pos[0])
+        self.ys.append(star_pos[1])
+        self.zs.append(star_pos[2])
+        return True
+
+    def add_system(self, system):
+        """
+        :param system: NavRoute entry, FSDJump event or StarDatabase result
+        """
+        if 'SystemAddress' not in system or 'StarPos' not in system:
+            return False
+        return self.add(system['SystemAddress'], system.get('StarSystem'), system['StarPos'], system.get('StarClass'))
+
+    def add_route(self, route):
+        self.add_systems(route or [])
+
+    def add_systems(self, systems):
+        """
+        add many systems with at most one rebuild
+        :return: number of new systems
+        """
+        count = 0
+        for system in systems:
+            if 'SystemAddress' in system and 'StarPos' in system and self.__insert(
+                    system['SystemAddress'], system.get('StarSystem'), system['StarPos'], system.get('StarClass')):
+                count += 1
+        if len(self.__pending) > self.max_pending:
+            self.rebuild()
+        return count
+
+    def rebuild(self):
+        axes = (self.xs, self.ys, self.zs)
+        tree = list(range(len(self.systems)))
+        stack = [(0, len(tree), 0)]
+        while len(stack) > 0:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            tree[lo:hi] = sorted(tree[lo:hi], key=axes[depth % 3].__getitem__)
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+        self.__tree = tree
+        self.__pending = []
+
+    def __distance2(self, index, point):
+        return (self.xs[index] - point[0]) ** 2 + (self.ys[index] - point[1]) ** 2 + (self.zs[index] - point[2]) ** 2
+
+    def within(self, point, radius):
+        """
+        :return: (distance, system) at most radius ly away, nearest first
+        """
+        axes = (self.xs, self.ys, self.zs)
+        radius2 = radius * radius
+        found = [i for i in self.__pending if self.__distance2(i, point) <= radius2]
+
+        tree = self.__tree
+        stack = [(0, len(tree), 0)]
+        while len(stack) > 0:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            index = tree[mid]
+            if self.__distance2(index, point) <= radius2:
+                found.append(index)
+            diff = point[depth % 3] - axes[depth % 3][index]
+            if diff <= radius:
+                stack.append((lo, mid, depth + 1))
+            if diff >= -radius:
+                stack.append((mid + 1, hi, depth + 1))
+
+        found.sort(key=lambda i: self.__distance2(i, point))
+        return [(math.sqrt(self.__distance2(i, point)), self.systems[i]) for i in found]
+
+    def nearest(self, point, k=1, predicate=None):
+        """
+        :param predicate: called with the system, only matching systems are returned
+        :return: up to k (distance, system), nearest first
+        """
+        axes = (self.xs, self.ys, self.zs)
+        tree = self.__tree
+        # max heap of the best k as (-distance², index)
+        best = []
+
+        def consider(index):
+            if predicate is not None and not predicate(self.systems[index]):
+                return
+            d2 = self.__distance2(index, point)
+            if len(best) < k:
+                heapq.heappush(best, (-d2, index))
+            elif d2 < -best[0][0]:
+                heapq.heapreplace(best, (-d2, index))
+
+        def search(lo, hi, depth):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            index = tree[mid]
+            consider(index)
+            diff = point[depth % 3] - axes[depth % 3][index]
+            if diff < 0:
+                near, far = (lo, mid), (mid + 1, hi)
+            else:
+                near, far = (mid + 1, hi), (lo, mid)
+            search(near[0], near[1], depth + 1)
+            # the other side can only help if the splitting plane is closer than the worst match
+            if len(best) < k or diff * diff < -best[0][0]:
+                search(far[0], far[1], depth + 1)
+
+        for index in self.__pending:
+            consider(index)
+        search(0, len(tree), 0)
+
+        return [(math.sqrt(-d2), self.systems[index]) for d2, index in sorted(best, reverse=True)]
+
+
+class StarLoader(threading.Thread):
+    """
+    Indexes the systems of the star database around visited positions away from the render loop
+    """
+
+    def __init__(self, path, radius=100, keep_distance=400):
+        """
+        :param keep_distance: neighbourhoods farther than this from the latest request are dropped
+        """
+        super(StarLoader, self).__init__(daemon=True)
+        self.path = path
+        self.radius = radius
+        self.keep_distance = keep_distance
+        # replaced by a new SpatialIndex after every load, never changed once published
+        self.index = SpatialIndex()
+        self.__requests = queue.Queue()
+        # center -> systems of every neighbourhood in the index
+        self.__neighbourhoods = OrderedDict()
+
+    def request(self, point):
+        """
+        load the neighbourhood of point unless it is already loaded
+        """
+        self.__requests.put(tuple(point))
+
+    def wait(self):
+        """
+        block until every request is handled
+        """
+        self.__requests.join()
+
+    def run(self):
+        # a sqlite connection is only usable by the thread that opened it
+        database = None
+        try:
+            while True:
+                point = self.__requests.get()
+                try:
+                    if point is None:
+                        break
+                    if database is None:
+                        database = StarDatabase(self.path)
+                    self.__load(database, point)
+                finally:
+                    self.__requests.task_done()
+        finally:
+            if database is not None:
+                database.close()
+
+    def __load(self, database, point):
+        if any(RouteIndex.get_distance(c, point) < self.radius / 2 for c in self.__neighbourhoods):
+            return
+        self.__neighbourhoods[point] = database.within(point, self.radius)
+        # the index only covers the area around the ship so its size and rebuild time stay bounded
+        for center in list(self.__neighbourhoods):
+            if RouteIndex.get_distance(center, point) > self.keep_distance:
+                del self.__neighbourhoods[center]
+
+        index = SpatialIndex()
+        index.add_systems(system for systems in self.__neighbourhoods.values() for system in systems)
+        index.rebuild()
+        self.index = index
+
+    def close(self):
+        self.__requests.put(None)
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,224 @@
+import argparse
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+from data.config import Config
+
+# long star names of the galaxy dumps that do not start with the journal StarType
+STAR_CLASSES = {
+    'neutron star': 'N',
+    'black hole': 'H',
+    'supermassive black hole': 'SupermassiveBlackHole',
+    't tauri star': 'TTS',
+    'herbig ae/be star': 'AeBe',
+    'wolf-rayet star': 'W',
+    'wolf-rayet n star': 'WN',
+    'wolf-rayet nc star': 'WNC',
+    'wolf-rayet c star': 'WC',
+    'wolf-rayet o star': 'WO',
+    'c star': 'C',
+    'cn star': 'CN',
+    'cj star': 'CJ',
+    'ms-type star': 'MS',
+    's-type star': 'S',
+}
+PATTERN_WHITE_DWARF = re.compile(r'white dwarf \((\w+)\)', re.IGNORECASE)
+PATTERN_STAR_CLASS = re.compile(r'^([A-Z]+)\b')
+
+
+def get_star_class(name):
+    """
+    :param name: star type as written by EDSM or Spansh, e.g. "K (Yellow-Orange) Star"
+    :return: journal StarType, None if unknown
+    """
+    if not name:
+        return None
+    star_class = STAR_CLASSES.get(name.lower())
+    if star_class is not None:
+        return star_class
+    match = PATTERN_WHITE_DWARF.match(name)
+    if match:
+        return match.group(1).upper()
+    match = PATTERN_STAR_CLASS.match(name)
+    if match:
+        return match.group(1)
+    return None
+
+
+def parse_system(line):
+    """
+    one system of a newline delimited dump or of a json array written one entry per line
+    :param line: bytes
+    :return: (address, name, x, y, z, star_class) or None
+    """
+    line = line.strip().rstrip(b',')
+    if len(line) == 0 or line in (b'[', b']'):
+        return None
+    try:
+        system = json.loads(line.decode('utf-8'))
+    except ValueError:
+        return None
+    if not isinstance(system, dict):
+        return None
+
+    # EDSM and Spansh use id64/coords, journal shaped dumps SystemAddress/StarPos
+    address = system.get('id64', system.get('SystemAddress'))
+    name = system.get('name', system.get('StarSystem'))
+    coords = system.get('coords')
+    if coords is not None:
+        coords = (coords.get('x'), coords.get('y'), coords.get('z'))
+    else:
+        coords = system.get('StarPos')
+    if address is None or name is None or coords is None or None in coords:
+        return None
+
+    star = system.get('mainStar', system.get('primaryStar'))
+    if isinstance(star, dict):
+        star = star.get('type')
+    star_class = get_star_class(star) if star is not None else system.get('StarClass')
+
+    return address, name, coords[0], coords[1], coords[2], star_class
+
+
+def open_dump(path):
+    """
+    :return: binary file, decompressed if it is gzipped
+    """
+    with open(path, 'rb') as fp:
+        is_gzip = fp.read(2) == b'\x1f\x8b'
+    return gzip.open(path, 'rb') if is_gzip else open(path, 'rb')
+
+
+class StarDatabase:
+    """
+    Offline positions and primary star class of systems, imported from galaxy dumps
+    """
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS stars ('
+        ' address INTEGER PRIMARY KEY, name TEXT NOT NULL COLLATE NOCASE,'
+        ' x REAL NOT NULL, y REAL NOT NULL, z REAL NOT NULL, star_class TEXT)',
+        'CREATE INDEX IF NOT EXISTS stars_name ON stars (name)',
+        # the y and z ranges are checked in the index, only matching rows are read
+        'CREATE INDEX IF NOT EXISTS stars_xyz ON stars (x, y, z)',
+        # position in the decompressed stream an interrupted import continues from
+        'CREATE TABLE IF NOT EXISTS imports ('
+        ' source TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, offset INTEGER NOT NULL)',
+    ]
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM stars').fetchone()[0]
+
+    def __get_import_offset(self, source, file_stat):
+        row = self.connection.execute(
+            'SELECT size, mtime, offset FROM imports WHERE source = ?', (source,)).fetchone()
+        # a changed dump is imported again from the start
+        if row is None or row[0] != file_stat.st_size or row[1] != file_stat.st_mtime:
+            return 0
+        return row[2]
+
+    def import_dump(self, path, batch_size=10000, progress=None):
+        """
+        stream a dump into the database, a second call continues where an interrupted one stopped
+        :param progress: called with the number of systems imported so far after every batch
+        :return: number of systems imported
+        """
+        source = os.path.abspath(path)
+        file_stat = os.stat(path)
+        offset = self.__get_import_offset(source, file_stat)
+        count = 0
+
+        with open_dump(path) as fp:
+            fp.seek(offset)
+            while True:
+                rows = []
+                for line in fp:
+                    system = parse_system(line)
+                    if system is not None:
+                        rows.append(system)
+                    if len(rows) >= batch_size:
+                        break
+
+                # rows and the offset after them are committed together
+                with self.connection:
+                    self.connection.executemany(
+                        'INSERT OR REPLACE INTO stars (address, name, x, y, z, star_class)'
+                        ' VALUES (?, ?, ?, ?, ?, ?)', rows)
+                    self.connection.execute(
+                        'INSERT OR REPLACE INTO imports (source, size, mtime, offset) VALUES (?, ?, ?, ?)',
+                        (source, file_stat.st_size, file_stat.st_mtime, fp.tell()))
+
+                count += len(rows)
+                if progress is not None:
+                    progress(count)
+                if len(rows) < batch_size:
+                    break
+
+        return count
+
+    @staticmethod
+    def __to_system(row):
+        address, name, x, y, z, star_class = row
+        return {
+            'SystemAddress': address,
+            'StarSystem': name,
+            'StarPos': [x, y, z],
+            'StarClass': star_class,
+        }
+
+    def get(self, address):
+        """
+        :return: system shaped like a NavRoute entry, None if unknown
+        """
+        row = self.connection.execute(
+            'SELECT address, name, x, y, z, star_class FROM stars WHERE address = ?', (address,)).fetchone()
+        return self.__to_system(row) if row is not None else None
+
+    def find(self, name):
+        """
+        :return: system by name ignoring case, None if unknown
+        """
+        row = self.connection.execute(
+            'SELECT address, name, x, y, z, star_class FROM stars WHERE name = ?', (name,)).fetchone()
+        return self.__to_system(row) if row is not None else None
+
+    def within(self, point, radius):
+        """
+        :return: systems at most radius ly away from point
+        """
+        x, y, z = point
+        rows = self.connection.execute(
+            'SELECT address, name, x, y, z, star_class FROM stars WHERE x BETWEEN ? AND ?'
+            ' AND y BETWEEN ? AND ? AND z BETWEEN ? AND ?',
+            (x - radius, x + radius, y - radius, y + radius, z - radius, z + radius))
+        return [self.__to_system(row) for row in rows
+                if math.sqrt((row[2] - x) ** 2 + (row[3] - y) ** 2 + (row[4] - z) ** 2) <= radius]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Import a galaxy dump')
+    parser.add_argument('dump', type=str, help="newline delimited or gzipped json systems")
+    parser.add_argument('--config', '-c', type=str, default='', help="config path")
+    parser.add_argument('--batch', type=int, default=10000, help="systems per transaction")
+    args = parser.parse_args()
+
+    config = Config(config_dir=args.config) if args.config else Config()
+    database = StarDatabase(config.get_stars_path())
+    imported = database.import_dump(args.dump, batch_size=args.batch,
+                                    progress=lambda n: print('\r{} systems'.format(n), end='', flush=True))
+    print('\rImported {} systems, {} in total'.format(imported, len(database)))
+    database.close()
@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from collections import Counter
+
+WORTHLESS = 'Worthless space rock'
+
+
+def get_planet_category(scan):
+    """
+    name a scanned body is counted under on the exploration card
+    :param scan: Scan event
+    :return: category or None if the scan is not a planet
+    """
+    if 'PlanetClass' not in scan:
+        return None
+    name = scan['PlanetClass']
+    name_lower = name.lower()
+    if scan.get('TerraformState', '') != '':
+        return "{} (T)".format(name)
+    if name_lower.find('earth') >= 0 or \
+            name_lower.find('water world') >= 0 or \
+            name_lower.find('ammonia world') >= 0:
+        return name
+    return WORTHLESS
+
+
+class ExplorationStats:
+    """
+    Scan counters over every journal ever written, checkpointed with how far each file was counted
+    """
+
+    def __init__(self, path, save_interval=30):
+        self.path = path
+        # seconds between checkpoints while scans keep arriving
+        self.save_interval = save_interval
+        # journal file name -> byte offset up to which its scans are counted
+        self.files = {}
+        # newest JournalIndex id already looked at
+        self.last_id = 0
+        self.planet_classes = Counter()
+        self.terraform_states = Counter()
+        self.categories = Counter()
+        self.__is_changed = False
+        self.__saved_at = time.monotonic()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as fp:
+                data = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return
+        self.files = data.get('files', {})
+        self.last_id = data.get('last_id', 0)
+        self.planet_classes = Counter(data.get('planet_classes', {}))
+        self.terraform_states = Counter(data.get('terraform_states', {}))
+        self.categories = Counter(data.get('categories', {}))
+
+    def save(self):
+        data = {
+            'files': self.files,
+            'last_id': self.last_id,
+            'planet_classes': self.planet_classes,
+            'terraform_states': self.terraform_states,
+            'categories': self.categories,
+        }
+        # never leave a half written checkpoint behind
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as fp:
+            json.dump(data, fp)
+        os.replace(temp_path, self.path)
+        self.__is_changed = False
+        self.__saved_at = time.monotonic()
+
+    def save_if_due(self):
+        if self.__is_changed and time.monotonic() - self.__saved_at >= self.save_interval:
+            self.save()
+
+    def close(self):
+        if self.__is_changed:
+            self.save()
+
+    def add(self, scan):
+        """
+        count a Scan event, events already counted from the same file position are skipped
+        :return: True if it was counted
+        """
+        source = getattr(scan, 'source', None)
+        if source is not None:
+            filename, offset = source
+            if offset <= self.files.get(filename, 0):
+                return False
+            self.files[filename] = offset
+            self.__is_changed = True
+
+        category = get_planet_category(scan)
+        if category is None:
+            return False
+        self.planet_classes[scan['PlanetClass']] += 1
+        if scan.get('TerraformState', '') != '':
+            self.terraform_states[scan['TerraformState']] += 1
+        self.categories[category] += 1
+        self.__is_changed = True
+        return True
+
+    def catch_up(self, index):
+        """
+        count the scans indexed since the last checkpoint
+        :param index: JournalIndex, already updated
+        :return: number of new scans
+        """
+        count = sum(1 for scan in index.query(event='Scan', after_id=self.last_id) if self.add(scan))
+        last_id = index.get_last_id()
+        if last_id != self.last_id:
+            self.last_id = last_id
+            self.__is_changed = True
+        if self.__is_changed:
+            self.save()
+        return count
@@ -0,0 +1,61 @@
+import json
+import os
+
+
+class StatusReader:
+    """
+    Keeps the last good Status.json snapshot, never blocks on a half written file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.status = None
+        # increases every time the content actually changes
+        self.version = 0
+        self.__raw = None
+        self.__stat_key = None
+        self.__is_torn = False
+
+    @property
+    def is_torn(self):
+        return self.__is_torn
+
+    def poll(self):
+        """
+        check the file once, meant to be called at most once per frame
+        :return: True if a new snapshot was read
+        """
+        try:
+            file_stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+
+        stat_key = (file_stat.st_mtime, file_stat.st_size)
+        # a torn read is retried on the next poll even if the file looks the same
+        if stat_key == self.__stat_key and not self.__is_torn:
+            return False
+
+        try:
+            with open(self.path, 'rb') as fp:
+                raw = fp.read()
+        except FileNotFoundError:
+            return False
+
+        # rewritten with identical content
+        if raw == self.__raw:
+            self.__stat_key = stat_key
+            self.__is_torn = False
+            return False
+
+        try:
+            status = json.loads(raw.decode('utf-8'))
+        except ValueError:
+            self.__is_torn = True
+            return False
+
+        self.__is_torn = False
+        self.__stat_key = stat_key
+        self.__raw = raw
+        self.status = status
+        self.version += 1
+        return True
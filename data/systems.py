@@ -0,0 +1,124 @@
+import json
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+
+# the part of a Scan the system card needs, everything else is dropped before storing
+BODY_FIELDS = (
+    'BodyID', 'BodyName', 'StarSystem', 'StarType', 'Subclass', 'PlanetClass', 'TerraformState',
+    'Atmosphere', 'Volcanism', 'Landable', 'SurfaceGravity', 'MassEM', 'Radius', 'SemiMajorAxis',
+    'Eccentricity', 'OrbitalRadius', 'Parents', 'WasDiscovered', 'WasMapped',
+    'ItemLabel', 'ShouldScan', 'POI',
+)
+
+
+def compact_bodies(bodies, fields=BODY_FIELDS):
+    """
+    :return: copy of the bodies with only the stored fields
+    """
+    return OrderedDict((body_id, {f: b[f] for f in fields if f in b}) for body_id, b in bodies.items())
+
+
+def encode_bodies(bodies, fields=BODY_FIELDS):
+    """
+    :param bodies: BodyID as string -> body
+    :return: compressed rows with one column per field
+    """
+    rows = [[b.get(f) for f in fields] for b in bodies.values()]
+    return zlib.compress(json.dumps({"f": fields, "b": rows}, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_bodies(data):
+    decoded = json.loads(zlib.decompress(data).decode('utf-8'))
+    fields = decoded["f"]
+    bodies = OrderedDict()
+    for row in decoded["b"]:
+        body = {f: v for f, v in zip(fields, row) if v is not None}
+        bodies[str(body['BodyID'])] = body
+    return bodies
+
+
+class SystemStore:
+    """
+    Bodies of every visited system by SystemAddress, the most recent ones kept in memory
+    """
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS systems ('
+        ' address INTEGER PRIMARY KEY, name TEXT NOT NULL, bodies BLOB NOT NULL)',
+    ]
+
+    def __init__(self, path, cache_size=256, flush_interval=30):
+        self.path = path
+        self.cache_size = cache_size
+        # seconds changed systems are held before they are written in one transaction
+        self.flush_interval = flush_interval
+        # address -> (name, bodies) not written yet
+        self.__dirty = OrderedDict()
+        self.__flushed_at = time.monotonic()
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+        # address -> (name, bodies), least recently used first
+        self.__cache = OrderedDict()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def __len__(self):
+        self.flush()
+        return self.connection.execute('SELECT COUNT(*) FROM systems').fetchone()[0]
+
+    @property
+    def cached(self):
+        return len(self.__cache)
+
+    def __remember(self, address, name, bodies):
+        self.__cache[address] = (name, bodies)
+        self.__cache.move_to_end(address)
+        while len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+
+    def get(self, address):
+        """
+        :return: copy of the stored bodies, None for an unknown system
+        """
+        if address in self.__cache:
+            self.__cache.move_to_end(address)
+            name, bodies = self.__cache[address]
+        elif address in self.__dirty:
+            name, bodies = self.__dirty[address]
+            self.__remember(address, name, bodies)
+        else:
+            row = self.connection.execute('SELECT name, bodies FROM systems WHERE address = ?', (address,)).fetchone()
+            if row is None:
+                return None
+            name, bodies = row[0], decode_bodies(row[1])
+            self.__remember(address, name, bodies)
+        # the card updates its bodies in place
+        return OrderedDict((body_id, dict(b)) for body_id, b in bodies.items())
+
+    def put(self, address, name, bodies):
+        """
+        remember the bodies of a system, written to disk by the next flush
+        """
+        bodies = compact_bodies(bodies)
+        self.__remember(address, name, bodies)
+        self.__dirty[address] = (name, bodies)
+        if time.monotonic() - self.__flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        write all changed systems in one transaction
+        """
+        self.__flushed_at = time.monotonic()
+        if len(self.__dirty) == 0:
+            return
+        rows = [(address, name, encode_bodies(bodies)) for address, (name, bodies) in self.__dirty.items()]
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO systems (address, name, bodies) VALUES (?, ?, ?)', rows)
+        self.__dirty.clear()
@@ -0,0 +1,63 @@
+import os
+
+
+class FileTail:
+    """
+    Follows a growing file by byte offset so that only appended bytes are read
+    """
+
+    def __init__(self, path, offset=0, inode=None):
+        self.path = path
+        self.offset = offset
+        self.inode = inode
+        # trailing bytes without a newline yet
+        self.pending = b''
+
+    def reset(self):
+        self.offset = 0
+        self.pending = b''
+
+    def read_lines(self):
+        """
+        read complete lines appended since the last call
+        :return: list of lines as bytes, without line endings
+        """
+        return [line for line, _ in self.read_entries()]
+
+    def read_entries(self):
+        """
+        same as read_lines with the position after each line
+        :return: list of (line, byte offset of the next line)
+        """
+        try:
+            file_stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        # replaced or truncated file, start over
+        if self.inode is not None and file_stat.st_ino != self.inode:
+            self.reset()
+        elif file_stat.st_size < self.offset:
+            self.reset()
+        self.inode = file_stat.st_ino
+
+        if file_stat.st_size == self.offset:
+            return []
+
+        with open(self.path, 'rb') as fp:
+            fp.seek(self.offset)
+            chunk = fp.read()
+        position = self.offset - len(self.pending)
+        self.offset += len(chunk)
+
+        data = self.pending + chunk
+        lines = data.split(b'\n')
+        # hold back a torn final line until its newline arrives
+        self.pending = lines.pop()
+
+        entries = []
+        for line in lines:
+            position += len(line) + 1
+            if line.strip():
+                entries.append((line.rstrip(b'\r'), position))
+        return entries
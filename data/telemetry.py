@@ -0,0 +1,160 @@
+import bisect
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+
+# seconds since race start, latitude, longitude, altitude, heading
+RECORD = struct.Struct('<5d')
+FIELDS = 5
+
+
+class TelemetryRecorder:
+    """
+    Appends status samples to a compact binary file
+    """
+
+    def __init__(self, path, flush_interval=5):
+        """
+        :raise FileExistsError: if path exists, a recorder never appends to another run
+        """
+        self.path = path
+        self.fp = open(path, 'xb')
+        self.samples = 0
+        # seconds of samples a crash may lose
+        self.flush_interval = flush_interval
+        self.__flushed_at = time.monotonic()
+
+    def append(self, t, lat, lng, alt=None, heading=None):
+        nan = float('nan')
+        self.fp.write(RECORD.pack(
+            t,
+            lat,
+            lng,
+            nan if alt is None else alt,
+            nan if heading is None else heading,
+        ))
+        self.samples += 1
+        if time.monotonic() - self.__flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.fp.flush()
+        self.__flushed_at = time.monotonic()
+
+    def close(self):
+        self.fp.close()
+
+
+class TelemetryTrack:
+    """
+    Recorded run held in arrays, position lookups by time are O(log n)
+    """
+
+    def __init__(self, samples):
+        """
+        :param samples: array('d') of interleaved records
+        """
+        self.times = samples[0::FIELDS]
+        self.lats = samples[1::FIELDS]
+        self.lngs = samples[2::FIELDS]
+        self.alts = samples[3::FIELDS]
+        self.headings = samples[4::FIELDS]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        samples = array('d')
+        # ignore a partially written record
+        samples.frombytes(data[:len(data) - len(data) % RECORD.size])
+        # records are little endian
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return cls(samples)
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def duration(self):
+        if len(self.times) == 0:
+            return 0.0
+        return self.times[-1]
+
+    def position_at(self, t):
+        """
+        :param t: seconds since race start
+        :return: interpolated (lat, lng), None if nothing was recorded
+        """
+        if len(self.times) == 0:
+            return None
+
+        index = bisect.bisect_right(self.times, t)
+        if index == 0:
+            return self.lats[0], self.lngs[0]
+        if index >= len(self.times):
+            return self.lats[-1], self.lngs[-1]
+
+        t0, t1 = self.times[index - 1], self.times[index]
+        ratio = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        return (
+            self.lats[index - 1] + (self.lats[index] - self.lats[index - 1]) * ratio,
+            self.lngs[index - 1] + (self.lngs[index] - self.lngs[index - 1]) * ratio,
+        )
+
+
+class TelemetryStore:
+    """
+    One directory per race, finished runs are named by duration so the best sorts first
+    """
+    RUN_EXTENSION = '.telemetry'
+    PARTIAL_EXTENSION = '.part'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def get_race_key(race_name):
+        return re.sub(r'[^\w.-]+', '_', race_name)
+
+    def __get_race_dir(self, race_name):
+        race_dir = os.path.join(self.directory, self.get_race_key(race_name))
+        os.makedirs(race_dir, exist_ok=True)
+        return race_dir
+
+    def start(self, race_name, started):
+        """
+        :param started: datetime of the race start
+        """
+        name = os.path.join(self.__get_race_dir(race_name), started.strftime('%Y%m%d%H%M%S'))
+        suffix = ''
+        # runs started in the same second each get their own file
+        while True:
+            try:
+                return TelemetryRecorder(name + suffix + self.PARTIAL_EXTENSION)
+            except FileExistsError:
+                suffix = '_{}'.format(int(suffix[1:] or 0) + 1)
+
+    def finish(self, recorder, duration):
+        """
+        keep a completed run
+        :param duration: seconds
+        """
+        recorder.close()
+        directory, filename = os.path.split(recorder.path)
+        name = '{:010d}ms_{}{}'.format(int(duration * 1000), filename[:-len(self.PARTIAL_EXTENSION)],
+                                       self.RUN_EXTENSION)
+        os.replace(recorder.path, os.path.join(directory, name))
+
+    def get_best(self, race_name):
+        """
+        :return: TelemetryTrack of the fastest finished run, None if there is none
+        """
+        race_dir = self.__get_race_dir(race_name)
+        runs = sorted(f for f in os.listdir(race_dir) if f.endswith(self.RUN_EXTENSION))
+        if len(runs) == 0:
+            return None
+        return TelemetryTrack.load(os.path.join(race_dir, runs[0]))
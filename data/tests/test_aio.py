@@ -0,0 +1,117 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from data.journal import JournalWatcher
+from data.notify import PollingNotifier
+import asyncio
+import tempfile
+import shutil
+import os
+
+
+class AsyncJournalTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with open(os.path.join(self.dir, 'Journal.200101000000.01.log'), 'w') as fp:
+            for i in range(5):
+                fp.write('{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","BodyID":%d}\n' % i)
+            fp.write('{"timestamp":"2020-01-01T00:00:01Z","event":"FSDJump","StarSystem":"Sol"}\n')
+        with open(os.path.join(self.dir, 'status.json'), 'w') as fp:
+            fp.write('{"timestamp":"2020-01-01T00:00:01Z","Flags":1}')
+        self.journal = JournalWatcher(directory=self.dir, config=MagicMock(), notifier=PollingNotifier())
+        self.journal.get_async().interval = 0.01
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_loop(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(asyncio.wait_for(coroutine, 5))
+        finally:
+            loop.run_until_complete(self.journal.get_async().close())
+            loop.close()
+
+    def test_streams(self):
+        async def consume():
+            scans = []
+            jumps = []
+            async with self.journal.stream(watch=['Scan'], maxsize=2) as scan_stream, \
+                    self.journal.stream(watch=['FSDJump']) as jump_stream:
+                async for e in scan_stream:
+                    scans.append(e['BodyID'])
+                    if len(scans) == 5:
+                        break
+                async for e in jump_stream:
+                    jumps.append(e['StarSystem'])
+                    break
+                status_stream = self.journal.status_stream()
+                status = await asyncio.wait_for(status_stream.__anext__(), 5)
+                status_stream.close()
+            return scans, jumps, status
+
+        scans, jumps, status = self.run_loop(consume())
+        self.assertEqual([0, 1, 2, 3, 4], scans)
+        self.assertEqual(['Sol'], jumps)
+        self.assertEqual(1, status['Flags'])
+
+    def test_slow_consumer(self):
+        async def consume():
+            # never read, its queue fills up after one event
+            stalled = self.journal.stream(watch=['Scan'], maxsize=1)
+            scans = []
+            async with self.journal.stream(watch=['Scan']) as scan_stream:
+                async for e in scan_stream:
+                    scans.append(e['BodyID'])
+                    if len(scans) == 5:
+                        break
+            with open(os.path.join(self.dir, 'status.json'), 'w') as fp:
+                fp.write('{"timestamp":"2020-01-01T00:00:02Z","Flags":2}')
+            status_stream = self.journal.status_stream()
+            while (await status_stream.__anext__())['Flags'] != 2:
+                pass
+            status_stream.close()
+            stalled.close()
+            return scans
+
+        self.assertEqual([0, 1, 2, 3, 4], self.run_loop(consume()))
+
+    def test_close_wakes_consumer(self):
+        async def consume():
+            stream = self.journal.stream(watch=['Unknown'])
+            waiting = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            stream.close()
+            with self.assertRaises(StopAsyncIteration):
+                await waiting
+
+        self.run_loop(consume())
+
+    def test_route_after_torn_write(self):
+        path = os.path.join(self.dir, 'NavRoute.json')
+        content = '{"Route": [{"SystemAddress": 1, "StarPos": [0, 0, 0]}]}'
+
+        async def consume():
+            with open(path, 'w') as fp:
+                fp.write(content[:10])
+            os.utime(path, (1000, 1000))
+            stream = self.journal.route_stream()
+            await asyncio.sleep(0.05)
+            # completed with the same mtime
+            with open(path, 'w') as fp:
+                fp.write(content)
+            os.utime(path, (1000, 1000))
+            route = await asyncio.wait_for(stream.__anext__(), 1)
+            stream.close()
+            return route
+
+        route = self.run_loop(consume())
+        self.assertEqual([1], [s['SystemAddress'] for s in route])
+
+    def test_backlog_overflow(self):
+        async def consume():
+            stream = self.journal.stream(watch=['Scan'], maxsize=1, max_backlog=2)
+            first = await asyncio.wait_for(stream.__anext__(), 1)
+            stream.close()
+            return first['BodyID'], stream.dropped
+
+        self.assertEqual((3, 3), self.run_loop(consume()))
@@ -0,0 +1,31 @@
+from unittest import TestCase
+from unittest.mock import patch
+from data import geodesic
+
+
+class GeodesicTestCase(TestCase):
+    def assert_engine(self):
+        self.assertAlmostEqual(111.195, geodesic.distance_km((0, 0), (0, 1)), places=3)
+        # across the pole is short, not 180 degrees of longitude
+        self.assertAlmostEqual(22.239, geodesic.distance_km((89.9, 0), (89.9, 180)), places=3)
+        self.assertAlmostEqual(90, geodesic.bearing((0, 0), (0, 1)))
+        self.assertAlmostEqual(0, geodesic.bearing((0, 0), (1, 0)))
+
+        points = [(0, 1), (1, 0), (0, -0.01)]
+        distances = geodesic.distances_km((0, 0), points)
+        self.assertAlmostEqual(111.195, distances[0], places=3)
+        self.assertAlmostEqual(1.112, distances[2], places=3)
+        self.assertEqual([90, 0, 270], [round(b) for b in geodesic.bearings((0, 0), points)])
+        self.assertEqual(2, geodesic.nearest((0, 0), points)[0])
+        self.assertEqual([2], geodesic.within_range((0, 0), points, 2))
+        self.assertEqual([1, 2], geodesic.within_range((0, 0), points, [2, 200, 2]))
+        self.assertEqual((-1, None), geodesic.nearest((0, 0), []))
+
+    def test_python(self):
+        with patch.object(geodesic, 'np', None):
+            self.assert_engine()
+
+    def test_numpy(self):
+        if geodesic.np is None:
+            self.skipTest("numpy not installed")
+        self.assert_engine()
@@ -0,0 +1,73 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from data.index import IndexUpdater, JournalIndex
+from data.journal import JournalWatcher
+from data.notify import PollingNotifier
+import tempfile
+import shutil
+import os
+
+
+class JournalIndexTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.index = JournalIndex(os.path.join(self.dir, 'index.sqlite3'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.dir)
+
+    def write(self, filename, text):
+        with open(os.path.join(self.dir, filename), 'a') as fp:
+            fp.write(text)
+
+    def test_incremental(self):
+        self.write('Journal.200101000000.01.log',
+                   '{"timestamp":"2020-01-01T00:00:00Z","event":"FSDJump","StarSystem":"Sol","SystemAddress":10}\n'
+                   '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","StarSystem":"Sol","BodyID":1}\n')
+        self.write('Journal.200102000000.01.log',
+                   '{"timestamp":"2020-01-02T00:00:00Z","event":"FSDJump","StarSystem":"Achenar","SystemAddress":20}\n'
+                   '{"timestamp":"2020-01-02T00:00:01Z","event":"Scan",')
+        self.assertEqual(3, self.index.update(self.dir))
+        self.assertEqual(0, self.index.update(self.dir))
+
+        self.write('Journal.200102000000.01.log', '"StarSystem":"Achenar","BodyID":2}\n')
+        self.assertEqual(1, self.index.update(self.dir))
+
+        self.assertEqual(2, self.index.count(event='Scan'))
+        self.assertEqual(['Sol', 'Achenar'], [e['StarSystem'] for e in self.index.query(event='FSDJump')])
+        self.assertEqual([2], [e['BodyID'] for e in self.index.query(event='Scan', star_system='Achenar')])
+        self.assertEqual(['FSDJump'], [e['event'] for e in self.index.query(system_address=10)])
+        self.assertEqual(2, len(self.index.query(since='2020-01-02T00:00:00Z')))
+        self.assertEqual(2020, self.index.query(limit=1)[0]['timestamp'].year)
+
+    def test_source(self):
+        self.write('Journal.200101000000.01.log',
+                   '{"timestamp":"2020-01-01T00:00:00Z","event":"FSDJump","StarSystem":"Sol","SystemAddress":10}\r\n'
+                   '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","StarSystem":"Sol","BodyID":1}\r\n')
+        self.index.update(self.dir)
+        last_id = self.index.get_last_id()
+        size = os.path.getsize(os.path.join(self.dir, 'Journal.200101000000.01.log'))
+        self.assertEqual(('Journal.200101000000.01.log', size), self.index.query(event='Scan')[0].source)
+
+        # the watcher reports the same position for the same line
+        watcher = JournalWatcher(directory=self.dir, watch=['Scan'], config=MagicMock(), notifier=PollingNotifier())
+        watcher.refresh()
+        self.assertEqual(self.index.query(event='Scan')[0].source, watcher.events[0].source)
+
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:02Z","event":"Scan","BodyID":2}\n')
+        self.index.update(self.dir)
+        self.assertEqual([2], [e['BodyID'] for e in self.index.query(after_id=last_id)])
+
+    def test_updater(self):
+        self.write('Journal.200101000000.01.log',
+                   '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","StarSystem":"Sol","BodyID":1}\n')
+        scans = []
+        updater = IndexUpdater(self.index.path, self.dir,
+                               on_done=lambda index: scans.extend(e['BodyID'] for e in index.query(event='Scan')))
+        updater.start()
+        updater.join(5)
+        self.assertEqual(1, updater.count)
+        self.assertEqual([1], scans)
+        self.assertIsNone(updater.error)
+        self.assertTrue(updater.is_done)
@@ -0,0 +1,76 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from data.journal import JournalWatcher
+from data.notify import PollingNotifier
+from data.ingest import ThreadedJournal
+import tempfile
+import shutil
+import time
+import os
+
+
+class ThreadedJournalTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with open(os.path.join(self.dir, 'Journal.200101000000.01.log'), 'w') as fp:
+            fp.write('{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","BodyID":1}\n')
+        with open(os.path.join(self.dir, 'status.json'), 'w') as fp:
+            fp.write('{"timestamp":"2020-01-01T00:00:01Z","Flags":1}')
+
+        watcher = JournalWatcher(directory=self.dir, config=MagicMock(), notifier=PollingNotifier())
+        self.journal = ThreadedJournal(watcher, interval=0.01)
+        self.journal.watch = ['Scan']
+
+    def tearDown(self):
+        self.journal.stop()
+        shutil.rmtree(self.dir)
+
+    def wait_for_events(self):
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if self.journal.refresh():
+                return self.journal.events
+            time.sleep(0.01)
+        return []
+
+    def test_handoff(self):
+        self.journal.start()
+        events = self.wait_for_events()
+        self.assertEqual([1], [e['BodyID'] for e in events])
+        self.assertEqual({"timestamp": "2020-01-01T00:00:01Z", "Flags": 1}, self.journal.get_status())
+
+        with open(os.path.join(self.dir, 'Journal.200101000000.01.log'), 'a') as fp:
+            fp.write('{"timestamp":"2020-01-01T00:00:02Z","event":"Scan","BodyID":2}\n')
+        events = self.wait_for_events()
+        self.assertEqual([2], [e['BodyID'] for e in events])
+
+    def test_route(self):
+        with open(os.path.join(self.dir, 'NavRoute.json'), 'w') as fp:
+            fp.write('{"Route": [{"SystemAddress": 1, "StarPos": [0, 0, 0]}, {"SystemAddress": 2, "StarPos": [3, 4, 0]}]}')
+        self.journal.start()
+        self.wait_for_events()
+        deadline = time.time() + 5
+        while self.journal.get_route() is None and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(2, len(self.journal.get_route()))
+        self.assertEqual(5.0, self.journal.get_route_index().total_distance)
+
+    def test_pending_bound(self):
+        worker = self.journal.worker
+        worker.max_batches = 0
+        worker.max_pending = 3
+        with open(os.path.join(self.dir, 'Journal.200101000000.01.log'), 'a') as fp:
+            for body_id in range(2, 7):
+                fp.write('{"timestamp":"2020-01-01T00:00:02Z","event":"Scan","BodyID":%d}\n' % body_id)
+        self.journal.start()
+        deadline = time.time() + 5
+        while worker.dropped == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(3, worker.dropped)
+
+    def test_worker_error(self):
+        self.journal.journal.refresh = MagicMock(side_effect=OSError('journal gone'))
+        self.journal.start()
+        self.journal.worker.join(5)
+        with self.assertRaises(OSError):
+            self.journal.refresh()
@@ -0,0 +1,135 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from data.journal import JournalWatcher, JournalEvent, EventBus, peek_event_name, parse_timestamp
+from datetime import datetime
+from data.notify import PollingNotifier
+import tempfile
+import shutil
+import os
+
+
+class JournalWatcherTestCase(TestCase):
+    def create_notifier(self):
+        return None
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.journal = JournalWatcher(directory=self.dir, watch=['Scan', 'FSDJump'], config=MagicMock(),
+                                      notifier=self.create_notifier())
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, filename, text):
+        with open(os.path.join(self.dir, filename), 'a') as fp:
+            fp.write(text)
+
+    def test_reads_only_appended_lines(self):
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:00Z","event":"Fileheader"}\n'
+                                                  '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","BodyID":1}\n')
+        self.journal.refresh()
+        self.assertTrue(self.journal.is_modified)
+        self.assertEqual([1], [e['BodyID'] for e in self.journal.events])
+
+        self.journal.refresh()
+        self.assertFalse(self.journal.is_modified)
+        self.assertEqual([], self.journal.events)
+
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:02Z","event":"Scan","BodyID":2}\n')
+        self.journal.refresh()
+        self.assertEqual([2], [e['BodyID'] for e in self.journal.events])
+
+    def test_torn_line(self):
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan",')
+        self.journal.refresh()
+        self.assertEqual([], self.journal.events)
+
+        self.write('Journal.200101000000.01.log', '"BodyID":3}\n')
+        self.journal.refresh()
+        self.assertEqual([3], [e['BodyID'] for e in self.journal.events])
+
+    def test_rollover(self):
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:01Z","event":"Scan","BodyID":1}\n')
+        self.journal.refresh()
+
+        self.write('Journal.200101000000.01.log', '{"timestamp":"2020-01-01T00:00:02Z","event":"Scan","BodyID":2}\n')
+        self.write('Journal.200101000000.02.log', '{"timestamp":"2020-01-01T00:00:03Z","event":"Scan","BodyID":3}\n')
+        self.journal.refresh()
+        self.assertEqual([2, 3], [e['BodyID'] for e in self.journal.events])
+
+        self.write('Journal.200101000000.02.log', '{"timestamp":"2020-01-01T00:00:04Z","event":"Scan","BodyID":4}\n')
+        self.journal.refresh()
+        self.assertEqual([4], [e['BodyID'] for e in self.journal.events])
+
+        # new session
+        self.write('Journal.200102000000.01.log', '{"timestamp":"2020-01-02T00:00:00Z","event":"Scan","BodyID":5}\n')
+        self.journal.refresh()
+        self.assertEqual([5], [e['BodyID'] for e in self.journal.events])
+
+    def test_route_cache(self):
+        self.assertEqual(None, self.journal.get_route())
+        self.write('NavRoute.json', '{"Route":[{"SystemAddress":10,"StarPos":[0,0,0]},'
+                                    '{"SystemAddress":20,"StarPos":[0,0,5]}]}')
+        route = self.journal.get_route()
+        self.assertEqual(2, len(route))
+        self.assertIs(route, self.journal.get_route())
+        self.assertEqual(1, self.journal.get_route_index().index_of(20))
+        self.assertEqual(5, self.journal.get_route_index().total_distance)
+
+
+class PollingJournalWatcherTestCase(JournalWatcherTestCase):
+    def create_notifier(self):
+        return PollingNotifier()
+
+
+class PeekEventNameTestCase(TestCase):
+    def test_peek(self):
+        self.assertEqual('Scan', peek_event_name(b'{ "timestamp":"2020-01-01T00:00:00Z", "event":"Scan", "BodyID":1 }'))
+        self.assertEqual('Music', peek_event_name(b'{"event" : "Music"}'))
+        self.assertEqual(None, peek_event_name(b'{"timestamp":"2020-01-01T00:00:00Z"}'))
+        self.assertEqual(None, peek_event_name(b'{"event":'))
+
+
+class TimestampTestCase(TestCase):
+    def test_parse(self):
+        self.assertEqual(datetime(2020, 1, 2, 3, 4, 5), parse_timestamp('2020-01-02T03:04:05Z'))
+        with self.assertRaises(ValueError):
+            parse_timestamp('2020-13-02T03:04:05Z')
+
+    def test_lazy(self):
+        e = JournalEvent({"timestamp": "2020-01-02T03:04:05Z", "event": "Scan"})
+        self.assertEqual("2020-01-02T03:04:05Z", dict.__getitem__(e, 'timestamp'))
+        self.assertEqual(datetime(2020, 1, 2, 3, 4, 5), e['timestamp'])
+        self.assertEqual(datetime(2020, 1, 2, 3, 4, 5), e.get('timestamp'))
+        self.assertEqual(None, e.get('BodyID'))
+
+    def test_lazy_views(self):
+        expected = datetime(2020, 1, 2, 3, 4, 5)
+        for view in (dict, lambda e: dict(e.items()), lambda e: list(e.values())[0], JournalEvent.copy):
+            e = JournalEvent({"timestamp": "2020-01-02T03:04:05Z", "event": "Scan"})
+            value = view(e)
+            if isinstance(value, dict):
+                value = dict.__getitem__(value, 'timestamp')
+            self.assertEqual(expected, value)
+        e = JournalEvent({"timestamp": "2020-01-02T03:04:05Z"})
+        self.assertEqual({"timestamp": expected}, e)
+        self.assertEqual(expected, e.pop('timestamp'))
+
+
+class EventBusTestCase(TestCase):
+    def test_dispatch(self):
+        bus = EventBus()
+        scans = MagicMock()
+        jumps = MagicMock()
+        bus.subscribe(['Scan'], scans)
+        bus.subscribe(['FSDJump', 'Scan'], jumps)
+
+        events = [{"event": "Scan", "BodyID": 1}, {"event": "Music"}, {"event": "FSDJump"}]
+        bus.dispatch(events)
+        scans.assert_called_once_with([events[0]])
+        jumps.assert_called_once_with([events[0], events[2]])
+        self.assertEqual({'Scan', 'FSDJump'}, set(bus.watched))
+
+        bus.unsubscribe(scans)
+        bus.dispatch(events)
+        self.assertEqual(1, scans.call_count)
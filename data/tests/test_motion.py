@@ -0,0 +1,47 @@
+from unittest import TestCase
+from data.motion import MotionModel
+
+
+class MotionModelTestCase(TestCase):
+    def test_empty(self):
+        self.assertIsNone(MotionModel().position_at(1.0))
+
+    def test_interpolate(self):
+        motion = MotionModel()
+        motion.add(0.0, 10.0, 20.0, 100.0)
+        motion.add(1.0, 11.0, 22.0, 200.0)
+        lat, lng, alt = motion.position_at(0.5)
+        self.assertAlmostEqual(10.5, lat)
+        self.assertAlmostEqual(21.0, lng)
+        self.assertAlmostEqual(150.0, alt)
+
+    def test_extrapolate_capped(self):
+        motion = MotionModel(max_extrapolation=0.5)
+        motion.add(0.0, 0.0, 0.0)
+        motion.add(1.0, 1.0, 1.0)
+        lat, lng, alt = motion.position_at(1.25)
+        self.assertAlmostEqual(1.25, lat)
+        self.assertAlmostEqual(1.25, lng)
+        self.assertIsNone(alt)
+        lat, lng, _ = motion.position_at(10.0)
+        self.assertAlmostEqual(1.5, lat)
+
+    def test_longitude_wrap(self):
+        motion = MotionModel()
+        motion.add(0.0, 0.0, 179.0)
+        motion.add(1.0, 0.0, -179.0)
+        _, lng, _ = motion.position_at(0.5)
+        self.assertAlmostEqual(180.0, abs(lng))
+        _, lng, _ = motion.position_at(1.5)
+        self.assertAlmostEqual(-178.0, lng)
+
+    def test_status(self):
+        motion = MotionModel()
+        motion.add_status(0.0, {"BodyName": "A 1", "Latitude": 1.0, "Longitude": 1.0})
+        motion.add_status(1.0, {"BodyName": "A 1", "Latitude": 2.0, "Longitude": 1.0})
+        self.assertEqual(2, len(motion.samples))
+        # another body does not share the velocity
+        motion.add_status(2.0, {"BodyName": "A 2", "Latitude": 5.0, "Longitude": 5.0})
+        self.assertEqual((5.0, 5.0, None), motion.position_at(3.0))
+        motion.add_status(3.0, {"Flags": 0})
+        self.assertIsNone(motion.position_at(3.0))
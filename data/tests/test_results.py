@@ -0,0 +1,44 @@
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+from data.results import RaceResults
+
+
+class RaceResultsTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'results.sqlite3')
+        self.results = RaceResults(self.path)
+
+    def tearDown(self):
+        self.results.close()
+        self.dir.cleanup()
+
+    def test_best_lap(self):
+        started = datetime(2020, 1, 1)
+        self.assertEqual([], self.results.get_best_lap('a.json', 'cmdr'))
+        self.assertIsNone(self.results.get_delta('a.json', 'cmdr', 1, 10.0))
+
+        self.results.save('a.json', 'cmdr', started, [0.0, 10.0, 30.0])
+        self.results.save('a.json', 'cmdr', started, [0.0, 8.0, 35.0])
+        self.results.save('a.json', 'other', started, [0.0, 5.0, 20.0])
+
+        self.assertEqual([0.0, 10.0, 30.0], self.results.get_best_lap('a.json', 'cmdr'))
+        self.assertAlmostEqual(-1.0, self.results.get_delta('a.json', 'cmdr', 1, 9.0))
+        self.assertEqual([0.0, 8.0, 30.0], self.results.get_best_splits('a.json', 'cmdr'))
+        self.assertEqual([('other', 20.0), ('cmdr', 30.0)], self.results.get_leaderboard('a.json'))
+
+    def test_reopen(self):
+        self.results.save('a.json', 'cmdr', datetime(2020, 1, 1), [0.0, 12.0])
+        self.results.close()
+        self.results = RaceResults(self.path)
+        self.assertEqual([0.0, 12.0], self.results.get_best_lap('a.json', 'cmdr'))
+
+    def test_save_on_reopened(self):
+        self.results.save('a.json', 'cmdr', datetime(2020, 1, 1), [0.0, 10.0])
+        self.results.close()
+        # nothing is cached yet when the slower run is saved
+        self.results = RaceResults(self.path)
+        self.results.save('a.json', 'cmdr', datetime(2020, 1, 2), [0.0, 50.0])
+        self.assertEqual([0.0, 10.0], self.results.get_best_lap('a.json', 'cmdr'))
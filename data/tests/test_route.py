@@ -0,0 +1,17 @@
+from unittest import TestCase
+from data.route import RouteIndex
+
+
+class RouteIndexTestCase(TestCase):
+    def test_index(self):
+        index = RouteIndex([
+            {"SystemAddress": 10, "StarPos": [0, 0, 0]},
+            {"SystemAddress": 20, "StarPos": [3, 4, 0]},
+            {"SystemAddress": 30, "StarPos": [3, 4, 10]},
+        ])
+        self.assertEqual(1, index.index_of(20))
+        self.assertEqual(-1, index.index_of(40))
+        self.assertEqual(15, index.total_distance)
+        self.assertEqual(10, index.remaining_distance(1))
+        self.assertEqual(10, index.distance_between(1, 2))
+        self.assertEqual(0, RouteIndex([]).total_distance)
@@ -0,0 +1,90 @@
+import math
+import os
+import random
+import tempfile
+from unittest import TestCase
+from data.spatial import SpatialIndex, StarLoader
+from data.stars import StarDatabase
+
+
+class SpatialIndexTestCase(TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.index = SpatialIndex(max_pending=16)
+        self.points = []
+        for address in range(500):
+            point = (random.uniform(-100, 100), random.uniform(-100, 100), random.uniform(-100, 100))
+            star_class = random.choice('KGBFOAMLTYN')
+            self.points.append((address, point, star_class))
+            self.index.add(address, 'System {}'.format(address), point, star_class)
+
+    def brute_force(self, point):
+        return sorted((math.sqrt(sum((a - b) ** 2 for a, b in zip(p, point))), address, c)
+                      for address, p, c in self.points)
+
+    def test_nearest(self):
+        for _ in range(20):
+            point = (random.uniform(-120, 120), random.uniform(-120, 120), random.uniform(-120, 120))
+            expected = self.brute_force(point)
+            found = self.index.nearest(point, k=5)
+            self.assertEqual([e[1] for e in expected[:5]], [s['SystemAddress'] for _, s in found])
+            self.assertAlmostEqual(expected[0][0], found[0][0])
+
+            scoopable = self.index.nearest(point, predicate=lambda s: s['StarClass'] in 'KGBFOAM')
+            self.assertEqual([e for e in expected if e[2] in 'KGBFOAM'][0][1], scoopable[0][1]['SystemAddress'])
+
+    def test_within(self):
+        point = (10, -5, 3)
+        expected = [e[1] for e in self.brute_force(point) if e[0] <= 40]
+        self.assertEqual(expected, [s['SystemAddress'] for _, s in self.index.within(point, 40)])
+
+    def test_incremental(self):
+        # pending systems are found before the next rebuild
+        self.index.add(1000, 'New', (500, 500, 500), 'K')
+        self.assertEqual(1000, self.index.nearest((501, 500, 500))[0][1]['SystemAddress'])
+        self.assertFalse(self.index.add(1000, 'New', (500, 500, 500)))
+        self.assertEqual('K', self.index.nearest((501, 500, 500))[0][1]['StarClass'])
+        self.assertEqual(501, len(self.index))
+
+    def test_empty(self):
+        self.assertEqual([], SpatialIndex().nearest((0, 0, 0)))
+        self.assertEqual([], SpatialIndex().within((0, 0, 0), 10))
+
+    def test_loader(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'stars.sqlite3')
+            database = StarDatabase(path)
+            with database.connection:
+                database.connection.executemany(
+                    'INSERT INTO stars (address, name, x, y, z, star_class) VALUES (?, ?, ?, ?, ?, ?)',
+                    [(i, 'S{}'.format(i), i * 10, 0, 0, 'M') for i in range(30)])
+            database.close()
+
+            loader = StarLoader(path, radius=50)
+            loader.start()
+            loader.request((0, 0, 0))
+            loader.wait()
+            index = loader.index
+            self.assertEqual(6, len(index))
+            # same neighbourhood is not queried again
+            loader.request((10, 0, 0))
+            loader.wait()
+            self.assertIs(index, loader.index)
+            loader.request((100, 0, 0))
+            loader.wait()
+            self.assertEqual(16, len(loader.index))
+            self.assertEqual(10, loader.index.nearest((101, 0, 0))[0][1]['SystemAddress'])
+            # published indexes are never changed
+            self.assertEqual(6, len(index))
+            loader.close()
+
+            # neighbourhoods far from the ship are dropped
+            loader = StarLoader(path, radius=50, keep_distance=150)
+            loader.start()
+            for point in ((0, 0, 0), (100, 0, 0), (250, 0, 0)):
+                loader.request(point)
+            loader.wait()
+            self.assertEqual(21, len(loader.index))
+            self.assertEqual(5, loader.index.nearest((0, 0, 0))[0][1]['SystemAddress'])
+            loader.close()
+            self.assertFalse(loader.is_alive())
@@ -0,0 +1,67 @@
+import gzip
+import json
+import os
+import tempfile
+from unittest import TestCase
+from data.stars import StarDatabase, get_star_class, parse_system
+
+
+def spansh(address, name, x, star):
+    return json.dumps({"id64": address, "name": name, "coords": {"x": x, "y": 0, "z": 0}, "mainStar": star})
+
+
+class StarDatabaseTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.database = StarDatabase(os.path.join(self.dir.name, 'stars.sqlite3'))
+
+    def tearDown(self):
+        self.database.close()
+        self.dir.cleanup()
+
+    def test_star_class(self):
+        self.assertEqual('K', get_star_class('K (Yellow-Orange) Star'))
+        self.assertEqual('M', get_star_class('M (Red giant) Star'))
+        self.assertEqual('DA', get_star_class('White Dwarf (DA) Star'))
+        self.assertEqual('N', get_star_class('Neutron Star'))
+        self.assertIsNone(get_star_class(None))
+
+    def test_parse(self):
+        self.assertIsNone(parse_system(b'['))
+        self.assertIsNone(parse_system(b'{"id64": 1, "name": "No coords"}'))
+        self.assertEqual((1, 'Sol', 0, 0, 0, 'G'), parse_system(b'{"id64": 1, "name": "Sol",'
+                                                                b' "coords": {"x": 0, "y": 0, "z": 0},'
+                                                                b' "primaryStar": {"type": "G (White-Yellow) Star"}},'))
+        self.assertEqual((2, 'A', 1, 2, 3, 'F'), parse_system(b'{"SystemAddress": 2, "StarSystem": "A",'
+                                                              b' "StarPos": [1, 2, 3], "StarClass": "F"}'))
+
+    def test_import_gzip_resume(self):
+        path = os.path.join(self.dir.name, 'galaxy.json.gz')
+        lines = ['['] + [spansh(i, 'System {}'.format(i), i, 'K (Yellow-Orange) Star') + ',' for i in range(25)] + [']']
+        with gzip.open(path, 'wt') as fp:
+            fp.write('\n'.join(lines) + '\n')
+
+        self.assertEqual(25, self.database.import_dump(path, batch_size=10))
+        self.assertEqual(25, len(self.database))
+        # nothing left to import
+        self.assertEqual(0, self.database.import_dump(path, batch_size=10))
+
+        self.assertEqual('System 3', self.database.get(3)['StarSystem'])
+        self.assertEqual([3, 0, 0], self.database.find('system 3')['StarPos'])
+        self.assertEqual('K', self.database.find('SYSTEM 3')['StarClass'])
+        self.assertEqual([4, 5, 6], sorted(s['SystemAddress'] for s in self.database.within((5, 0, 0), 1.5)))
+
+    def test_resume(self):
+        path = os.path.join(self.dir.name, 'galaxy.json')
+        with open(path, 'w') as fp:
+            fp.write('\n'.join(spansh(i, 'S{}'.format(i), i, 'M (Red dwarf) Star') for i in range(20)) + '\n')
+
+        def interrupt(count):
+            if count >= 10:
+                raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.database.import_dump(path, batch_size=5, progress=interrupt)
+        self.assertEqual(10, len(self.database))
+        self.assertEqual(10, self.database.import_dump(path, batch_size=5))
+        self.assertEqual(20, len(self.database))
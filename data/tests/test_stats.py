@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock
+from data.index import JournalIndex
+from data.journal import JournalWatcher
+from data.notify import PollingNotifier
+from data.stats import ExplorationStats, get_planet_category, WORTHLESS
+
+JOURNAL = 'Journal.200101000000.01.log'
+
+
+def scan(planet_class, terraform_state=''):
+    return json.dumps({
+        "timestamp": "2020-01-01T00:00:00Z", "event": "Scan",
+        "PlanetClass": planet_class, "TerraformState": terraform_state,
+    }) + '\n'
+
+
+class ExplorationStatsTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.dir.name, 'stats.json')
+        self.index = JournalIndex(os.path.join(self.dir.name, 'index.sqlite3'))
+
+    def tearDown(self):
+        self.index.close()
+        self.dir.cleanup()
+
+    def write(self, name, text):
+        with open(os.path.join(self.dir.name, name), 'a') as fp:
+            fp.write(text)
+
+    def start_session(self):
+        """
+        what the program does on startup
+        """
+        self.index.update(self.dir.name)
+        stats = ExplorationStats(self.checkpoint)
+        stats.catch_up(self.index)
+        watcher = JournalWatcher(directory=self.dir.name, watch=['Scan'], config=MagicMock(),
+                                 notifier=PollingNotifier())
+        return stats, watcher
+
+    def test_category(self):
+        self.assertEqual('Earthlike body', get_planet_category({"PlanetClass": "Earthlike body"}))
+        self.assertEqual('Icy body (T)', get_planet_category({"PlanetClass": "Icy body", "TerraformState": "Terraformable"}))
+        self.assertEqual(WORTHLESS, get_planet_category({"PlanetClass": "Icy body", "TerraformState": ""}))
+        self.assertIsNone(get_planet_category({"StarType": "K"}))
+
+    def test_sessions(self):
+        self.write(JOURNAL, scan('Water world') + '{"timestamp": "2020-01-01T00:00:00Z", "event": "FSDJump"}\n')
+        stats, watcher = self.start_session()
+        self.assertEqual(1, stats.categories['Water world'])
+
+        # the watcher replays the indexed part of the session, it is not counted twice
+        watcher.refresh()
+        self.assertEqual(0, sum(stats.add(e) for e in watcher.events))
+
+        # live scans are counted once, the checkpoint is written on close
+        self.write(JOURNAL, scan('Icy body'))
+        watcher.refresh()
+        self.assertEqual(1, sum(stats.add(e) for e in watcher.events))
+        self.write(JOURNAL, scan('High metal content body', 'Terraformable'))
+        stats.close()
+
+        # the scan written after the checkpoint is picked up from the index on the next start
+        self.write('Journal.200102000000.01.log', scan('Water world'))
+        stats, watcher = self.start_session()
+        watcher.refresh()
+        self.assertEqual(0, sum(stats.add(e) for e in watcher.events))
+        self.assertEqual(2, stats.categories['Water world'])
+        self.assertEqual(1, stats.categories['High metal content body (T)'])
+        self.assertEqual(1, stats.categories[WORTHLESS])
+        self.assertEqual(1, stats.terraform_states['Terraformable'])
+        self.assertEqual(4, sum(stats.planet_classes.values()))
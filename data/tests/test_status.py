@@ -0,0 +1,45 @@
+from unittest import TestCase
+from data.status import StatusReader
+import tempfile
+import shutil
+import os
+
+
+class StatusReaderTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'status.json')
+        self.reader = StatusReader(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, text, mtime):
+        with open(self.path, 'w') as fp:
+            fp.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_poll(self):
+        self.assertFalse(self.reader.poll())
+        self.assertEqual(None, self.reader.status)
+
+        self.write('{"Flags":1}', 1)
+        self.assertTrue(self.reader.poll())
+        self.assertEqual({"Flags": 1}, self.reader.status)
+        self.assertEqual(1, self.reader.version)
+
+        # torn write keeps the last good snapshot
+        self.write('{"Flags":', 2)
+        self.assertFalse(self.reader.poll())
+        self.assertTrue(self.reader.is_torn)
+        self.assertEqual({"Flags": 1}, self.reader.status)
+
+        self.write('{"Flags":2}', 2)
+        self.assertTrue(self.reader.poll())
+        self.assertEqual({"Flags": 2}, self.reader.status)
+        self.assertEqual(2, self.reader.version)
+
+        # identical rewrite
+        self.write('{"Flags":2}', 3)
+        self.assertFalse(self.reader.poll())
+        self.assertEqual(2, self.reader.version)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from collections import OrderedDict
+from unittest import TestCase
+from data.systems import SystemStore
+
+
+def bodies(count):
+    return OrderedDict((str(i), {
+        "BodyID": i, "BodyName": "Sol {}".format(i), "StarSystem": "Sol", "PlanetClass": "Icy body",
+        "POI": ["Interesting"], "ShouldScan": False, "ScanType": "Detailed",
+    }) for i in range(count))
+
+
+class SystemStoreTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'systems.sqlite3')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        store = SystemStore(self.path)
+        self.assertIsNone(store.get(1))
+        store.put(1, 'Sol', bodies(3))
+        store.close()
+
+        store = SystemStore(self.path)
+        loaded = store.get(1)
+        self.assertEqual(['0', '1', '2'], list(loaded.keys()))
+        self.assertEqual(["Interesting"], loaded['1']['POI'])
+        # only the fields the card needs are kept
+        self.assertNotIn('ScanType', loaded['1'])
+        # callers get their own copy
+        loaded['1']['POI'] = []
+        self.assertEqual(["Interesting"], store.get(1)['1']['POI'])
+        store.close()
+
+    def test_bounded_cache(self):
+        store = SystemStore(self.path, cache_size=2)
+        for address in range(5):
+            store.put(address, 'System {}'.format(address), bodies(2))
+        self.assertEqual(2, store.cached)
+        self.assertEqual(5, len(store))
+        self.assertEqual(2, len(store.get(0)))
+        self.assertEqual(2, store.cached)
+        store.close()
+
+    def test_batched_writes(self):
+        store = SystemStore(self.path, cache_size=1)
+        store.put(1, 'Sol', bodies(2))
+        store.put(2, 'Achenar', bodies(3))
+        # nothing is written before the flush, evicted systems are still found
+        other = SystemStore(self.path)
+        self.assertIsNone(other.get(1))
+        self.assertEqual(2, len(store.get(1)))
+        store.close()
+        self.assertEqual(3, len(other.get(2)))
+        other.close()
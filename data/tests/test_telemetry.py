@@ -0,0 +1,56 @@
+from unittest import TestCase
+from data.telemetry import RECORD, TelemetryStore
+from datetime import datetime
+import tempfile
+import shutil
+
+
+class TelemetryStoreTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = TelemetryStore(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def record(self, started, samples):
+        recorder = self.store.start('Sample Race', started)
+        for sample in samples:
+            recorder.append(*sample)
+        self.store.finish(recorder, samples[-1][0])
+
+    def test_best_run(self):
+        self.assertEqual(None, self.store.get_best('Sample Race'))
+
+        self.record(datetime(2020, 1, 1, 1), [(0, 0, 0, 10, 90), (10, 0, 1, 10, 90), (20, 1, 1, None, None)])
+        self.record(datetime(2020, 1, 1, 2), [(0, 0, 0, 10, 90), (5, 0, 1, 10, 90), (12, 1, 1, 10, 0)])
+        # unfinished run
+        self.store.start('Sample Race', datetime(2020, 1, 1, 3)).append(0, 5, 5)
+
+        ghost = self.store.get_best('Sample Race')
+        self.assertEqual(3, len(ghost))
+        self.assertEqual(12, ghost.duration)
+        self.assertEqual((0, 0), ghost.position_at(-1))
+        self.assertEqual((0, 0.5), ghost.position_at(2.5))
+        self.assertEqual((0.5, 1), ghost.position_at(8.5))
+        self.assertEqual((1, 1), ghost.position_at(100))
+
+    def test_same_second(self):
+        started = datetime(2020, 1, 1, 1)
+        # abandoned run, its file is left behind
+        abandoned = self.store.start('Sample Race', started)
+        abandoned.append(0, 5, 5)
+        abandoned.close()
+        self.record(started, [(0, 0, 0), (10, 1, 1)])
+        ghost = self.store.get_best('Sample Race')
+        self.assertEqual(2, len(ghost))
+        self.assertEqual((0, 0), ghost.position_at(0))
+
+    def test_flush(self):
+        recorder = self.store.start('Sample Race', datetime(2020, 1, 1, 1))
+        recorder.flush_interval = 0
+        recorder.append(0, 1, 2)
+        # readable before the run is closed
+        with open(recorder.path, 'rb') as fp:
+            self.assertEqual(RECORD.size, len(fp.read()))
+        recorder.close()
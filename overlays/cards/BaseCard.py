@@ -1,25 +1,65 @@
 from overlays import constants
+from overlays.text import text_cache
+from overlays.fonts import font_pool
 import pygame
 
 
 class BaseCard:
     line_y = 0
+    # event bus this card is subscribed to, None reads journal.events directly
+    bus = None
+    # bumped for every batch of events received, the card rebuilds when it differs from built_version
+    data_version = 0
+    built_version = 0
 
-    def __init__(self, screen, journal, position=(0, 0), text_align='left', card_size=(1, 1)):
+    def __init__(self, screen, journal, position=(0, 0), text_align='left', card_size=(1, 1), background=None,
+                 scale_fonts=False):
         self.screen = screen
+        # color to clear the card area of the screen with, None to draw over it
+        self.background = background
+        # surface has to be drawn again
+        self.is_dirty = True
         self.journal = journal
         self.position = position
         self.card_size = card_size
         self.text_align = text_align
-        self.h1_font = pygame.font.Font(constants.FONT, 16)
-        self.normal_font = pygame.font.Font(constants.FONT, 12)
 
         width, height = screen.get_size()
+        if scale_fonts:
+            self.h1_font = font_pool.get_scaled(16, height)
+            self.normal_font = font_pool.get_scaled(12, height)
+        else:
+            self.h1_font = font_pool.get(16)
+            self.normal_font = font_pool.get(12)
+
         self.width, self.height = size = ((width // (3 / self.card_size[0])), height // (3 / self.card_size[1]))
 
         self.surface = pygame.Surface(size, pygame.SRCALPHA)
         self.clear()
 
+    def subscribe(self, bus):
+        self.bus = bus
+        self.__inbox = []
+        bus.subscribe(self.watched(), self.on_events)
+
+    def on_events(self, events):
+        self.__inbox.extend(events)
+        self.data_version += 1
+
+    @property
+    def events(self):
+        """
+        events to build from, only the watched ones when subscribed to a bus
+        """
+        if self.bus is None:
+            return self.journal.events
+        return self.__inbox
+
+    def is_build_needed(self):
+        if self.bus is None:
+            return self.journal.is_modified
+        return self.data_version != self.built_version
+
     def clear(self):
         self.surface.fill((0, 0, 0, 0))
         self.line_y = 0
@@ -28,10 +68,16 @@ class BaseCard:
     def mpss_to_g(mpss):
         return mpss / 9.80665
 
-    def print_line(self, screen, font, text, color=None):
+    def print_line(self, screen, font, text, color=None, is_cached=True):
+        """
+        :param is_cached: False for text that changes every frame, it would only push stable labels out of the cache
+        """
         if color is None:
             color = constants.COLOR_COCKPIT
-        name_text = font.render(text, False, color)
+        if is_cached:
+            name_text = text_cache.render(font, text, color)
+        else:
+            name_text = font.render(text, False, color)
         name_rect = name_text.get_rect()
         if self.text_align == 'left':
             name_rect.left = constants.MARGIN
@@ -50,6 +96,21 @@ class BaseCard:
             (self.position[0] * card_width + card_width, self.position[1] * card_height + card_height),
         )
 
+    def get_rect(self):
+        return pygame.Rect(self.get_blit_position()[0], self.surface.get_size())
+
+    def is_animated(self):
+        """
+        :return: True if the card has to be drawn again even without new data
+        """
+        return False
+
+    def perform_update(self):
+        """
+        called every frame, even when nothing is drawn
+        """
+        pass
+
     def perform_draw(self):
         raise NotImplementedError()
 
@@ -57,11 +118,28 @@ class BaseCard:
         raise NotImplementedError()
 
     def render(self):
-        self.clear()
-        if self.journal.is_modified:
+        """
+        :return: the changed screen area, None if nothing was drawn
+        """
+        self.perform_update()
+        if self.is_build_needed():
             self.perform_build_data()
+            self.built_version = self.data_version
+            if self.bus is not None:
+                self.__inbox = []
+            self.is_dirty = True
+
+        if not self.is_dirty and not self.is_animated():
+            return None
+
+        self.clear()
         self.perform_draw()
-        self.screen.blit(self.surface, self.get_blit_position())
+        rect = self.get_rect()
+        if self.background is not None:
+            self.screen.fill(self.background, rect)
+        self.screen.blit(self.surface, rect)
+        self.is_dirty = False
+        return rect
 
     @staticmethod
     def watched():
@@ -2,14 +2,20 @@ from collections import OrderedDict
 from overlays import constants
 import math
 from overlays.cards.BaseCard import BaseCard
+from overlays.poi import PoiRules
 
 
 class CurrentSystemCard(BaseCard):
     bodies = OrderedDict()
     current_system = ''
 
-    HIGH_GRAVITY_THREASHOLD = 1
-    PARENT_SIZE_IN_VIEW_THREASHOLD = 10
+    current_address = None
+
+    def __init__(self, *args, rules=None, system_store=None, **kwargs):
+        super(CurrentSystemCard, self).__init__(*args, **kwargs)
+        self.rules = rules if rules is not None else PoiRules()
+        # SystemStore to show known bodies right after a jump
+        self.system_store = system_store
 
     @staticmethod
     def watched():
@@ -25,39 +31,6 @@ class CurrentSystemCard(BaseCard):
         else:
             return None
 
-    def __get_is_moonrise(self, body):
-        if 'ParentSizeInPicturePlane' in body:
-            return False
-        if 'OrbitalRadius' not in body:
-            return False
-        if 'Parents' not in body:
-            return False
-
-        parent_id = None
-        for _, id in body['Parents'][0].items():
-            if id == 0:
-                continue
-            parent_id = str(id)
-
-        if parent_id not in self.bodies.keys():
-            return False
-
-        parent = self.bodies[parent_id]
-
-        if 'Radius' not in parent:
-            return False
-        if 'Radius' not in body:
-            return False
-
-        parent_diameter = parent['Radius'] * 2
-        distance_to_parent = body['OrbitalRadius'] - body['Radius']
-        picture_plane_size = math.tan(45) * distance_to_parent * 2
-        body_view_size = parent_diameter / picture_plane_size * 100
-        if body_view_size >= self.PARENT_SIZE_IN_VIEW_THREASHOLD:
-            return 'Moonrise {}% of the sky'.format(body_view_size)
-        else:
-            return False
-
     @staticmethod
     def __get_item_label(b):
         if b['BodyName'][0:len(b['StarSystem'])] == b['StarSystem']:
@@ -77,55 +50,28 @@ class CurrentSystemCard(BaseCard):
 
         return item_label
 
-    @staticmethod
-    def __get_should_scan(b):
-        if 'PlanetClass' in b and b['PlanetClass'] != '':
-            class_lower = b['PlanetClass'].lower()
-            if class_lower.find('earth') >= 0 or \
-                    class_lower.find('water world') >= 0 or \
-                    class_lower.find('ammonia world') >= 0:
-                return True
-
-        if 'TerraformState' in b and b['TerraformState'] != '':
-            return True
-
-        return False
-
-    @staticmethod
-    def __get_is_interesting_star(b):
-        is_interesting = False
-        if 'StarType' in b and b['StarType'] != '':
-            is_interesting = True if b['StarType'].upper() in [
-                'H', 'N', 'X', 'TTS', 'AEBE',
-                'SUPERMASSIVEBLACKHOLE', 'ROGUEPLANET'
-            ] else False
-        return 'Interesting' if is_interesting else False
-
-    def __get_is_high_g(self, b):
-        if 'Landable' in b and b['Landable']:
-            if 'SurfaceGravity' in b:
-                gravity = self.mpss_to_g(b['SurfaceGravity'])
-                if gravity >= self.HIGH_GRAVITY_THREASHOLD:
-                    return 'High G planet'
-        return False
-
-    def add_poi(self, function, body):
-        value = function(body)
-        if 'POI' not in body:
-            body['POI'] = []
-        if value:
-            body['POI'].append(value)
+    def enter_system(self, name, address):
+        self.current_system = name
+        self.current_address = address
+        bodies = None
+        if self.system_store is not None and address is not None:
+            bodies = self.system_store.get(address)
+        self.bodies = bodies if bodies is not None else OrderedDict()
 
     def perform_build_data(self):
-        for e in self.journal.events:
+        is_scanned = False
+        for e in self.events:
+            if e['event'] == 'FSDJump':
+                self.enter_system(e['StarSystem'], e.get('SystemAddress'))
+
             if e['event'] == 'Scan' and 'BodyID' in e:
 
                 if 'PlanetClass' not in e and 'StarType' not in e:
                     continue
 
                 if 'StarSystem' in e and e['StarSystem'] != self.current_system:
-                    self.bodies = OrderedDict()
-                    self.current_system = e['StarSystem']
+                    self.enter_system(e['StarSystem'], e.get('SystemAddress'))
+                is_scanned = True
 
                 body_id = str(e['BodyID'])
                 if body_id in self.bodies:
@@ -139,14 +85,9 @@ class CurrentSystemCard(BaseCard):
                         self.bodies[body_id]['OrbitalRadius'] = orbital_radius
 
                 self.bodies[body_id]['ItemLabel'] = self.__get_item_label(e)
-                self.bodies[body_id]['ShouldScan'] = self.__get_should_scan(e)
-
-                self.add_poi(self.__get_is_interesting_star, e)
-                self.add_poi(self.__get_is_high_g, e)
 
-            if e['event'] == 'FSSAllBodiesFound':
-                for i, b in self.bodies.items():
-                    self.add_poi(self.__get_is_moonrise, e)
+        # all bodies at once, moons need their parent
+        self.rules.evaluate(self.bodies)
 
         # re order by ID
         keys = self.bodies.keys()
@@ -156,6 +97,9 @@ class CurrentSystemCard(BaseCard):
             new_bodies[k] = self.bodies[k]
         self.bodies = new_bodies
 
+        if is_scanned and self.system_store is not None and self.current_address is not None:
+            self.system_store.put(self.current_address, self.current_system, self.bodies)
+
     def perform_draw(self):
 
         self.print_line(self.surface, self.h1_font, self.current_system)
@@ -1,11 +1,24 @@
 from collections import OrderedDict
 from overlays import constants
 from overlays.cards.BaseCard import BaseCard
+from overlays.text import text_cache
+from data.stats import get_planet_category
 
 
 class ExplorationCard(BaseCard):
     planets = {}
 
+    def __init__(self, *args, stats=None, index_updater=None, **kwargs):
+        super(ExplorationCard, self).__init__(*args, **kwargs)
+        # ExplorationStats with the totals of all sessions, None to count this session only
+        self.stats = stats
+        # IndexUpdater catching the stats up, it owns them until it is done
+        self.index_updater = index_updater
+        # scans received while the stats are caught up
+        self.held_scans = []
+        if self.stats:
+            self.planets = dict(self.stats.categories)
+
     @staticmethod
     def watched():
         return ['Scan']
@@ -20,7 +33,7 @@ class ExplorationCard(BaseCard):
         # print
 
         if len(data_dict) == 0:
-            item_text = font.render("Go Explore!", False, constants.COLOR_COCKPIT)
+            item_text = text_cache.render(font, "Go Explore!", constants.COLOR_COCKPIT)
             items_rect = item_text.get_rect()
             if self.text_align == 'left':
                 items_rect.left = x
@@ -36,20 +49,35 @@ class ExplorationCard(BaseCard):
 
                             )
 
+    def perform_update(self):
+        if self.index_updater is None or not self.index_updater.is_done:
+            return
+        if self.index_updater.error is not None:
+            raise self.index_updater.error
+        self.index_updater = None
+        for e in self.held_scans:
+            self.stats.add(e)
+        self.held_scans = []
+        self.planets = dict(self.stats.categories)
+        self.is_dirty = True
+
     def perform_build_data(self):
-        for e in self.journal.events:
-            if e['event'] == 'Scan' and 'PlanetClass' in e:
-                n = e['PlanetClass']
-                n_lower = n.lower()
-                if 'TerraformState' in e and e['TerraformState'] != '':
-                    n = "{} (T)".format(n)
-                elif n_lower.find('earth') >= 0 or \
-                        n_lower.find('water world') >= 0 or \
-                        n_lower.find('ammonia world') >= 0:
-                    pass
-                else:
-                    n = 'Worthless space rock'
+        if self.stats:
+            scans = [e for e in self.events if e['event'] == 'Scan']
+            if self.index_updater is not None:
+                self.held_scans.extend(scans)
+                return
+            for e in scans:
+                self.stats.add(e)
+            self.planets = dict(self.stats.categories)
+            self.stats.save_if_due()
+            return
 
+        for e in self.events:
+            if e['event'] == 'Scan':
+                n = get_planet_category(e)
+                if n is None:
+                    continue
                 if n not in self.planets:
                     self.planets[n] = 0
                 self.planets[n] += 1
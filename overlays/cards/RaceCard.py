@@ -2,7 +2,11 @@ from overlays import constants
 import pygame
 from datetime import datetime, timedelta
 from overlays.cards.BaseCard import BaseCard
+from overlays.text import text_cache
+from data import geodesic
+from data.telemetry import TelemetryStore
 import math
+import os
 
 
 class RaceCard(BaseCard):
@@ -15,10 +19,30 @@ class RaceCard(BaseCard):
     SRV_MINIMUM_DEGREE = 0.01
     MIN_DISTANCE = 0.5
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, telemetry_dir=None, results=None, **kwargs):
         super(RaceCard, self).__init__(*args, **kwargs)
+        self.drawn_status_version = None
+        self.drawn_position = None
+        # waypoint indexes in range of the last status sample
+        self.ranged_status = None
+        self.gates_in_range = set()
+        # pre-rendered track, drawn again only when its key changes
+        self.__track = None
+        self.__track_key = None
+        self.__track_bounds = None
+        self.__track_position = (0, 0)
+        # status samples of the current run and the best run to race against
+        self.telemetry = TelemetryStore(telemetry_dir) if telemetry_dir else None
+        self.recorder = None
+        self.recorded_status_version = None
+        self.ghost = None
+        # RaceResults to save finished runs to and compare against
+        self.results = results
+        self.delta = None
         self.init_race()
         self.journal.include_pass_event()
+        if self.telemetry and self.race:
+            self.ghost = self.telemetry.get_best(self.get_race_key())
 
     def init_race(self):
         self.race = self.journal.get_race_details()
@@ -26,10 +50,33 @@ class RaceCard(BaseCard):
             self.waypoints = [None] * len(self.race['waypoints'])
         self.time_start = None
         self.time_end = None
+        self.delta = None
+
+    def get_race_key(self):
+        """
+        :return: race file name results and telemetry are stored under, the race name without a file
+        """
+        race_file = self.journal.config.selected_race
+        if isinstance(race_file, str) and race_file:
+            return os.path.basename(race_file)
+        return self.race['name']
+
+    def get_results_key(self):
+        """
+        :return: (race key, commander) the results are stored under
+        """
+        return self.get_race_key(), self.journal.commander or ''
+
+    def update_results(self, index):
+        race, commander = self.get_results_key()
+        splits = [(w - self.time_start).total_seconds() for w in self.waypoints[:index + 1]]
+        self.delta = self.results.get_delta(race, commander, index, splits[-1])
+        if index == len(self.waypoints) - 1:
+            self.results.save(race, commander, self.time_start, splits)
 
     @staticmethod
     def watched():
-        return ['LaunchFighter', 'DockFighter', 'Liftoff', 'Touchdown']
+        return ['LaunchFighter', 'DockFighter', 'Liftoff', 'Touchdown', 'Pass']
 
     def get_current_waypoint(self):
         index = -1
@@ -44,6 +91,23 @@ class RaceCard(BaseCard):
             index = len(self.race['waypoints']) - 1
             return index, self.race['waypoints'][index]
 
+    def is_animated(self):
+        # running timer
+        if self.is_race_started() and not self.is_race_done():
+            return True
+        # ship position changed
+        if self.journal.status_version != self.drawn_status_version:
+            return True
+        # still moving between two status updates
+        return self.get_display_position() != self.drawn_position
+
+    def remember_drawn(self):
+        """
+        state is_animated compares against, called at the end of perform_draw
+        """
+        self.drawn_status_version = self.journal.status_version
+        self.drawn_position = self.get_display_position()
+
     def is_race_done(self):
         return self.time_end is not None
 
@@ -55,12 +119,23 @@ class RaceCard(BaseCard):
         if index == 0:
             self.time_start = self.journal.now()
             self.waypoints[index] = self.time_start
+            if self.telemetry:
+                self.recorder = self.telemetry.start(self.get_race_key(), self.time_start)
         elif index == len(self.waypoints) - 1:
             self.time_end = self.journal.now()
             self.waypoints[index] = self.time_end
+            if self.recorder:
+                self.record_telemetry()
+                self.telemetry.finish(self.recorder, (self.time_end - self.time_start).total_seconds())
+                self.recorder = None
+                # race the faster of the old best and this run next time
+                self.ghost = self.telemetry.get_best(self.get_race_key())
         else:
             self.waypoints[index] = self.journal.now()
 
+        if self.results and index > 0:
+            self.update_results(index)
+
     @staticmethod
     def get_km_per_degree(planet_radius):
         return (planet_radius / 1000) * 2 * math.pi / 360
@@ -72,10 +147,61 @@ class RaceCard(BaseCard):
 
     @staticmethod
     def get_distance_as_degree(a, b):
-        return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+        """
+        great-circle angle between two lat/lng
+        """
+        return math.degrees(geodesic.central_angle(a, b))
+
+    def get_waypoints_in_range(self, lat, lng, planet_radius):
+        """
+        :return: indexes of all race waypoints whose range includes the position
+        """
+        waypoints = self.race['waypoints']
+        return geodesic.within_range(
+            (lat, lng),
+            [(w['lat'], w['lng']) for w in waypoints],
+            [w.get('range', self.MIN_DISTANCE) for w in waypoints],
+            planet_radius,
+        )
+
+    def record_telemetry(self):
+        status = self.journal.get_status()
+        if not status or status.get('Latitude') is None or status.get('Longitude') is None:
+            return
+        self.recorder.append(
+            (self.journal.now() - self.time_start).total_seconds(),
+            status['Latitude'],
+            status['Longitude'],
+            status.get('Altitude'),
+            status.get('Heading'),
+        )
+
+    def perform_update(self):
+        status = self.journal.get_status()
+        # gates around the ship, checked once per status sample for all waypoints together
+        if status is not self.ranged_status:
+            self.ranged_status = status
+            self.gates_in_range = set()
+            if status and self.race and status.get('BodyName') == self.race.get('body'):
+                lat, lng, planet_radius, _ = self.get_ship_position()
+                if lat is not None and lng is not None:
+                    self.gates_in_range = set(self.get_waypoints_in_range(lat, lng, planet_radius))
+
+        # every new status sample while racing
+        if self.recorder is None:
+            return
+        status_version = self.journal.status_version
+        if status_version != self.recorded_status_version:
+            self.recorded_status_version = status_version
+            self.record_telemetry()
 
     def get_ship_position(self):
+        """
+        :return: (lat, lng, planet radius, alt), all None without a status
+        """
         status = self.journal.get_status()
+        if not status:
+            return None, None, None, None
         lat = status.get('Latitude', None)
         lng = status.get('Longitude', None)
         alt = status.get('Altitude', None)
@@ -83,24 +209,25 @@ class RaceCard(BaseCard):
         rad = status.get('PlanetRadius', 6371000)
         return lat, lng, rad, alt
 
+    def get_display_position(self):
+        """
+        dead reckoned position for drawing, gates are still checked against the raw status
+        :return: (lat, lng), None for both without a position
+        """
+        predicted = self.journal.get_predicted_position()
+        if predicted is not None:
+            return predicted[0], predicted[1]
+        lat, lng, _, _ = self.get_ship_position()
+        return lat, lng
+
     def perform_build_data(self):
 
         current_waypoint_index, current_waypoint = self.get_current_waypoint()
-        status = self.journal.get_status()
-
-        wp_lat = current_waypoint['lat']
-        wp_lng = current_waypoint['lng']
-        wp_range_km = current_waypoint.get('range', self.MIN_DISTANCE)
         wp_event = current_waypoint['event']
-        body_name = self.race.get('body')
 
-        for e in self.journal.events:
-            if e['event'] == wp_event and status and status.get('BodyName') == body_name:
-                lat, lng, planet_radius, alt = self.get_ship_position()
-                if lat is not None and lng is not None:
-                    distance = self.get_distance_as_km((lat, lng), (wp_lat, wp_lng), planet_radius)
-                    if distance <= wp_range_km:
-                        self.waypoint_done(current_waypoint_index)
+        for e in self.events:
+            if e['event'] == wp_event and current_waypoint_index in self.gates_in_range:
+                self.waypoint_done(current_waypoint_index)
 
     def __get_bounds(self, base_wp):
         x_max = None
@@ -133,48 +260,75 @@ class RaceCard(BaseCard):
         top_pad = self.line_y
 
         size = min(self.surface.get_width(), self.surface.get_height())
-        race_box = pygame.Surface((size - top_pad, size - top_pad), pygame.SRCALPHA)
+        box_size = (size - top_pad, size - top_pad)
+
+        track_key = (id(base_wp), len(base_wp), progress_wp, box_size)
+        if track_key != self.__track_key:
+            self.__track = self.__render_track(base_wp, progress_wp, box_size)
+            self.__track_key = track_key
+
+        if self.__track is not None:
+            self.__track_position = (
+                self.surface.get_width() // 2 - self.__track.get_width() // 2,
+                (self.surface.get_height() // 2 - self.__track.get_height() // 2) + (top_pad // 2)
+            )
+            self.surface.blit(self.__track, self.__track_position)
+
+    def draw_marker(self, lat, lng, color):
+        """
+        draw a position on top of the track
+        """
+        if self.__track is None or lat is None or lng is None:
+            return
+        x, y = self.__get_surface_coords_from_lat_lng((lat, lng), self.__track_bounds, self.__track)
+        pygame.draw.circle(self.surface, color, (x + self.__track_position[0], y + self.__track_position[1]), 5)
+
+    def __render_track(self, base_wp, progress_wp, box_size):
+        """
+        :return: surface with the projected waypoints, None if there is nothing to draw
+        """
+        bounds = self.__get_bounds(base_wp)
+        if not bounds or bounds[1][0] - bounds[0][0] + bounds[1][-1] - bounds[0][1] == 0:
+            return None
+        self.__track_bounds = bounds
+
+        race_box = pygame.Surface(box_size, pygame.SRCALPHA)
         # draw race track
         # pygame.draw.rect(race_box, constants.COLOR_COCKPIT, (0, 0, race_box.get_width(), race_box.get_height()), 1)
 
-        bounds = self.__get_bounds(base_wp)
         coord_list = []
-        if bounds and bounds[1][0] - bounds[0][0] + bounds[1][-1] - bounds[0][1] != 0:
-            for w_index, w in enumerate(base_wp):
-                coord = self.__get_surface_coords_from_lat_lng((w['lat'], w['lng']), bounds, race_box)
-
-                button_size = 10
-
-                label = None
-                if w['event'] == 'LaunchFighter':
-                    label = "L"
-                elif w['event'] == 'DockFighter':
-                    label = "D"
-                elif w['event'] == 'Liftoff':
-                    label = "L"
-                elif w['event'] == 'Touchdown':
-                    label = "T"
-
-                color = constants.COLOR_INTERESTING_3 if progress_wp >= w_index else constants.COLOR_COCKPIT
-
-                if label:
-                    pygame.draw.circle(race_box, color, coord, button_size)
-                    dot_label = self.normal_font.render(label, False, pygame.Color("black"))
-                    dot_label_rect = dot_label.get_rect()
-                    dot_label_rect.center = coord
-                    race_box.blit(dot_label, dot_label_rect)
-
-                coord_list.append(coord)
-                if len(coord_list) > 2:
-                    coord_list = coord_list[-2:]
-
-                if len(coord_list) >= 2:
-                    pygame.draw.line(race_box, color, coord_list[0], coord_list[1], 2)
-
-            self.surface.blit(race_box, (
-                self.surface.get_width() // 2 - race_box.get_width() // 2,
-                (self.surface.get_height() // 2 - race_box.get_height() // 2) + (top_pad // 2)
-            ))
+        for w_index, w in enumerate(base_wp):
+            coord = self.__get_surface_coords_from_lat_lng((w['lat'], w['lng']), bounds, race_box)
+
+            button_size = 10
+
+            label = None
+            if w['event'] == 'LaunchFighter':
+                label = "L"
+            elif w['event'] == 'DockFighter':
+                label = "D"
+            elif w['event'] == 'Liftoff':
+                label = "L"
+            elif w['event'] == 'Touchdown':
+                label = "T"
+
+            color = constants.COLOR_INTERESTING_3 if progress_wp >= w_index else constants.COLOR_COCKPIT
+
+            if label:
+                pygame.draw.circle(race_box, color, coord, button_size)
+                dot_label = text_cache.render(self.normal_font, label, pygame.Color("black"))
+                dot_label_rect = dot_label.get_rect()
+                dot_label_rect.center = coord
+                race_box.blit(dot_label, dot_label_rect)
+
+            coord_list.append(coord)
+            if len(coord_list) > 2:
+                coord_list = coord_list[-2:]
+
+            if len(coord_list) >= 2:
+                pygame.draw.line(race_box, color, coord_list[0], coord_list[1], 2)
+
+        return race_box
 
     @staticmethod
     def __get_surface_coords_from_lat_lng(coord, bounds, surface):
@@ -183,6 +337,9 @@ class RaceCard(BaseCard):
 
         def get_percent(mi, ma, v):
             total = ma - mi
+            # straight track along one axis
+            if total == 0:
+                return 0.5
             amt = v - mi
             return amt / total
 
@@ -225,7 +382,11 @@ class RaceCard(BaseCard):
                                                     elapsed.microseconds // 1000)
 
         if text:
-            self.print_line(self.surface, self.h1_font, text, constants.COLOR_COCKPIT)
+            # the running timer is a new string every frame
+            self.print_line(self.surface, self.h1_font, text, constants.COLOR_COCKPIT, is_cached=end is not None)
+
+        if self.delta is not None:
+            self.print_line(self.surface, self.h1_font, "Best {:+.3f}s".format(self.delta), constants.COLOR_COCKPIT)
 
     def __draw_next_waypoint(self):
         index, _ = self.get_current_waypoint()
@@ -236,18 +397,18 @@ class RaceCard(BaseCard):
             next_wp = self.race['waypoints'][0]
 
         if self.journal.get_status():
-            lat, lng, rad, alt = self.get_ship_position()
+            lat, lng = self.get_display_position()
             t_lat = next_wp.get("lat", None)
             t_lng = next_wp.get("lng", None)
 
             if lat and lng and t_lat and t_lng:
-                rad = math.atan2(t_lng - lng, t_lat - lat)
-                deg = math.degrees(rad) % 360
+                deg = geodesic.bearing((lat, lng), (t_lat, t_lng))
                 planet_radius = self.journal.get_status().get("PlanetRadius")
                 distance = self.get_distance_as_km((lat, lng), (t_lat, t_lng), planet_radius)
 
                 text = "{} Lat: {:0.3f} Lng: {:0.3f} Hdg: {:0.3f} Dst: {:0.3f}".format(next_wp.get('event'), t_lat, t_lng, deg, distance)
-                self.print_line(self.surface, self.h1_font, text, constants.COLOR_COCKPIT)
+                # heading and distance follow the predicted position every frame
+                self.print_line(self.surface, self.h1_font, text, constants.COLOR_COCKPIT, is_cached=False)
 
     def perform_draw(self):
         index, _ = self.get_current_waypoint()
@@ -255,6 +416,17 @@ class RaceCard(BaseCard):
         self.__draw_time(self.time_start, self.time_end)
         self.draw_waypoints(self.race['waypoints'], index)
 
+        if self.ghost and self.is_race_started() and not self.is_race_done():
+            position = self.ghost.position_at((self.journal.now() - self.time_start).total_seconds())
+            if position:
+                self.draw_marker(position[0], position[1], constants.COLOR_GHOST)
+
+        lat, lng = self.get_display_position()
+        if lat is not None and lng is not None:
+            self.draw_marker(lat, lng, constants.COLOR_SHIP)
+
+        self.remember_drawn()
+
 
 class CreateRaceCard(RaceCard):
     new_map_waypoints = []
@@ -271,7 +443,7 @@ class CreateRaceCard(RaceCard):
 
     def perform_build_data(self):
         if len(self.new_map_waypoints) == 0:
-            for e in self.journal.events:
+            for e in self.events:
                 print("event", e['event'], e['timestamp'], self.race_create_start_time)
                 if e['event'] in ['LaunchFighter', 'Liftoff'] and e['timestamp'] > self.race_create_start_time:
                     lat, lng, planet_radius, alt = self.get_ship_position()
@@ -283,7 +455,7 @@ class CreateRaceCard(RaceCard):
                     self.save()
                     break
         else:
-            for e in self.journal.events:
+            for e in self.events:
                 if e['event'] in ['DockFighter', 'Touchdown', 'Pass'] and e['timestamp'] > self.race_create_start_time:
                     lat, lng, planet_radius, alt = self.get_ship_position()
                     wp = {"event": e['event'], "lat": lat, "lng": lng}
@@ -298,3 +470,4 @@ class CreateRaceCard(RaceCard):
 
     def perform_draw(self):
         self.draw_waypoints(self.new_map_waypoints)
+        self.remember_drawn()
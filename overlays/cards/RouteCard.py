@@ -2,6 +2,7 @@ from overlays import constants
 import pygame
 from datetime import datetime, timedelta
 from overlays.cards.BaseCard import BaseCard
+from overlays.text import text_cache
 
 
 class RouteCard(BaseCard):
@@ -15,13 +16,24 @@ class RouteCard(BaseCard):
     jump_time_history = []
     last_time_in_system = None
     eta = None
+    remaining_distance = None
+    nearest_scoopable = None
+
+    SCOOPABLE = frozenset('KGBFOAM')
+
+    def __init__(self, *args, spatial=None, stars=None, **kwargs):
+        super(RouteCard, self).__init__(*args, **kwargs)
+        # SpatialIndex of known systems to look for fuel stars
+        self.spatial = spatial
+        # optional StarLoader indexing the star database around the ship in the background
+        self.stars = stars
 
     @staticmethod
     def watched():
         return ['NavRoute', 'FSDJump']
 
     def perform_build_data(self):
-        for e in self.journal.events:
+        for e in self.events:
             if e['event'] == 'NavRoute':
                 self.route = self.journal.get_route()
                 self.jump_time_history = []
@@ -38,6 +50,13 @@ class RouteCard(BaseCard):
                 self.last_jump_time = current_time
                 if 'StarPos' in e:
                     self.current_coords = e['StarPos']
+                    if self.spatial is not None:
+                        self.spatial.add_system(e)
+                    if self.stars is not None:
+                        self.stars.request(self.current_coords)
+
+            if e['event'] in ('NavRoute', 'FSDJump') and self.spatial is not None:
+                self.spatial.add_route(self.route)
 
             if len(self.route) == 0:
                 self.start_coords = None
@@ -49,11 +68,12 @@ class RouteCard(BaseCard):
                     self.end_coords = self.route[-1]['StarPos']
 
             if 'SystemAddress' in e:
-                self.position_in_route = -1
-                for route_pos, r in enumerate(self.route):
-                    if r['SystemAddress'] == self.current_address:
-                        self.position_in_route = route_pos
-                        break
+                route_index = self.journal.get_route_index()
+                self.position_in_route = route_index.index_of(self.current_address)
+                if self.position_in_route >= 0:
+                    self.remaining_distance = route_index.remaining_distance(self.position_in_route)
+                else:
+                    self.remaining_distance = None
 
             if self.last_time_in_system and self.position_in_route and len(self.route) > 0 and len(
                     self.jump_time_history) > 0:
@@ -62,6 +82,21 @@ class RouteCard(BaseCard):
             else:
                 self.eta = None
 
+        if self.spatial is not None and self.current_coords is not None:
+            self.nearest_scoopable = self.get_nearest_scoopable()
+
+    def get_nearest_scoopable(self):
+        """
+        :return: (distance, system) of the closest other system with a scoopable star, None if unknown
+        """
+        def predicate(s):
+            return s['StarClass'] in self.SCOOPABLE and s['SystemAddress'] != self.current_address
+
+        found = self.spatial.nearest(self.current_coords, predicate=predicate)
+        if self.stars is not None:
+            found += self.stars.index.nearest(self.current_coords, predicate=predicate)
+        return min(found, key=lambda f: f[0]) if len(found) > 0 else None
+
     def perform_draw(self):
 
         route_slice = list(enumerate(self.route))
@@ -94,6 +129,15 @@ class RouteCard(BaseCard):
                 self.print_line(self.surface, self.normal_font,
                                 "ETA: {:0.1f} weeks".format(self.eta.seconds / 60 / 60 / 24 / 7))
 
+        if self.remaining_distance:
+            self.print_line(self.surface, self.normal_font,
+                            "Remaining: {:0.1f} ly".format(self.remaining_distance))
+
+        if self.nearest_scoopable:
+            distance_ly, system = self.nearest_scoopable
+            self.print_line(self.surface, self.normal_font,
+                            "Scoopable: {} ({}) {:0.1f} ly".format(system['StarSystem'], system['StarClass'], distance_ly))
+
         for list_index, (position_index, stop) in enumerate(route_slice):
             radius = 20
             x = distance + (list_index * distance)
@@ -111,7 +155,8 @@ class RouteCard(BaseCard):
                     (x, y),
                     radius,
                 )
-                dot_label = self.normal_font.render(str(len(self.route) - position_index), False, pygame.Color("black"))
+                dot_label = text_cache.render(self.normal_font, str(len(self.route) - position_index),
+                                              pygame.Color("black"))
                 dot_label_rect = dot_label.get_rect()
                 dot_label_rect.center = (x, y)
                 self.surface.blit(dot_label, dot_label_rect)
@@ -123,7 +168,7 @@ class RouteCard(BaseCard):
                     radius,
                     1
                 )
-                dot_label = self.normal_font.render(str(len(self.route) - position_index), False, color)
+                dot_label = text_cache.render(self.normal_font, str(len(self.route) - position_index), color)
                 dot_label_rect = dot_label.get_rect()
                 dot_label_rect.center = (x, y)
                 self.surface.blit(dot_label, dot_label_rect)
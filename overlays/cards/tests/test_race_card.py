@@ -2,6 +2,8 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 from overlays.cards import RaceCard
 from datetime import datetime
+import tempfile
+import os
 
 
 class RaceCardTestCase(TestCase):
@@ -164,4 +166,58 @@ class RaceCardTestCase(TestCase):
         card.render()
         self.assertEqual(time_start, card.waypoints[0])
         self.assertEqual(time_w1, card.waypoints[1])
-        self.assertEqual(time_end, card.waypoints[2])
\ No newline at end of file
+        self.assertEqual(time_end, card.waypoints[2])
+
+    @patch('data.journal.JournalWatcher')
+    @patch('pygame.surface.Surface')
+    @patch('pygame.font.Font')
+    def test_ghost_after_finish(self, journal_class, surface_class, font_class):
+        journal = journal_class()
+        surface = surface_class()
+        surface.get_size.return_value = (100, 100)
+        journal.config.selected_race = '/races/sample.json'
+        journal.get_race_details.return_value = {
+            "name": "Sample Race",
+            "waypoints": [
+                {"event": "Pass", "lat": 0, "lng": 0},
+                {"event": "Pass", "lat": 0, "lng": 1},
+            ]
+        }
+        journal.get_status.return_value = {"Latitude": 0, "Longitude": 0}
+
+        with tempfile.TemporaryDirectory() as telemetry_dir:
+            card = RaceCard(surface, journal, telemetry_dir=telemetry_dir)
+            self.assertIsNone(card.ghost)
+
+            journal.now.return_value = datetime(2020, 1, 1, 1, 0, 0)
+            card.waypoint_done(0)
+            journal.now.return_value = datetime(2020, 1, 1, 1, 0, 30)
+            card.waypoint_done(1)
+
+            # stored under the race file like the results, and raced against right away
+            self.assertEqual(['sample.json'], os.listdir(telemetry_dir))
+            self.assertIsNotNone(card.ghost)
+
+    @patch('pygame.surface.Surface')
+    @patch('pygame.font.Font')
+    def test_without_status(self, surface_class, font_class):
+        from data.journal import JournalWatcher
+        from data.notify import PollingNotifier
+        surface = surface_class()
+        surface.get_size.return_value = (100, 100)
+        config = MagicMock()
+        config.get_race_details.return_value = {
+            "name": "Sample Race",
+            "waypoints": [{"event": "Pass", "lat": 0, "lng": 0}, {"event": "Pass", "lat": 0, "lng": 1}]
+        }
+        with tempfile.TemporaryDirectory() as journal_dir:
+            with open(os.path.join(journal_dir, 'Journal.200101000000.01.log'), 'w') as fp:
+                fp.write('{"timestamp":"2020-01-01T00:00:00Z","event":"Music"}\n')
+            journal = JournalWatcher(directory=journal_dir, config=config, notifier=PollingNotifier())
+            card = RaceCard(surface, journal)
+            for frame in range(3):
+                journal.refresh()
+                card.render()
+            self.assertEqual((None, None, None, None), card.get_ship_position())
+            # nothing moves, so nothing is redrawn
+            self.assertFalse(card.is_animated())
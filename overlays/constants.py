@@ -6,5 +6,9 @@ COLOR_DANGER = (255, 0, 0)
 COLOR_INTERESTING_1 = (158, 165, 255)
 COLOR_INTERESTING_2 = (94, 105, 255)
 COLOR_INTERESTING_3 = (0, 0, 255)
+COLOR_SHIP = (255, 255, 255)
+COLOR_GHOST = (158, 165, 255)
 MARGIN = 10
-TITLE = "Elite: Dangerous Companion"
\ No newline at end of file
+TITLE = "Elite: Dangerous Companion"
+# memory bound of the rendered text cache
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
@@ -0,0 +1,37 @@
+from overlays import constants
+import pygame
+
+
+class FontPool:
+    """
+    Loads each (font path, size) once and hands out the shared pygame font
+    """
+    # window height the default font sizes were chosen for
+    BASE_HEIGHT = 720
+
+    def __init__(self):
+        self.__fonts = {}
+        self.loads = 0
+
+    def get(self, size, path=constants.FONT):
+        key = (path, size)
+        if key not in self.__fonts:
+            self.__fonts[key] = pygame.font.Font(path, size)
+            self.loads += 1
+        return self.__fonts[key]
+
+    def get_scaled(self, size, screen_height, path=constants.FONT):
+        """
+        :param size: size at BASE_HEIGHT
+        """
+        return self.get(self.get_scaled_size(size, screen_height), path)
+
+    def get_scaled_size(self, size, screen_height):
+        return max(1, int(round(size * screen_height / self.BASE_HEIGHT)))
+
+    def clear(self):
+        self.__fonts.clear()
+
+
+# shared by all cards
+font_pool = FontPool()
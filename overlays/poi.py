@@ -0,0 +1,212 @@
+import json
+import logging
+import math
+
+STANDARD_GRAVITY = 9.80665
+
+# rules used when the config dir has no poi_rules.json
+DEFAULT_RULES = [
+    {
+        "label": "ShouldScan",
+        "type": "scan",
+        "any": [
+            {"field": "PlanetClass", "contains": ["earth", "water world", "ammonia world"]},
+            {"field": "TerraformState", "not_empty": True},
+        ],
+    },
+    {
+        "label": "Interesting",
+        "all": [
+            {"field": "StarType", "in": ["H", "N", "X", "TTS", "AEBE", "SUPERMASSIVEBLACKHOLE", "ROGUEPLANET"]},
+        ],
+    },
+    {
+        "label": "High G planet",
+        "all": [
+            {"field": "Landable", "equals": True},
+            {"field": "SurfaceGravity", "min": 1, "unit": "g"},
+        ],
+    },
+    {
+        "label": "Moonrise {}% of the sky",
+        "builtin": "moonrise",
+        "min": 10,
+    },
+]
+
+UNITS = {
+    None: 1,
+    "g": STANDARD_GRAVITY,
+}
+
+
+def get_parent_id(body):
+    parent_id = None
+    for _, id in body['Parents'][0].items():
+        if id == 0:
+            continue
+        parent_id = str(id)
+    return parent_id
+
+
+def moonrise(rule):
+    """
+    size of the parent in the sky of a moon
+    """
+    threshold = rule.get("min", 10)
+    label = rule["label"]
+
+    def evaluate(body, bodies):
+        if 'ParentSizeInPicturePlane' in body:
+            return False
+        if 'OrbitalRadius' not in body or 'Parents' not in body or 'Radius' not in body:
+            return False
+
+        parent = bodies.get(get_parent_id(body))
+        if parent is None or 'Radius' not in parent:
+            return False
+
+        parent_diameter = parent['Radius'] * 2
+        distance_to_parent = body['OrbitalRadius'] - body['Radius']
+        picture_plane_size = math.tan(45) * distance_to_parent * 2
+        body_view_size = parent_diameter / picture_plane_size * 100
+        if body_view_size >= threshold:
+            return label.format(body_view_size)
+        return False
+
+    return evaluate
+
+
+BUILTINS = {
+    "moonrise": moonrise,
+}
+
+
+def compile_condition(condition):
+    """
+    :return: function of a body returning True if the condition holds
+    """
+    field = condition["field"]
+    missing = object()
+
+    if "in" in condition:
+        values = frozenset(str(v).lower() for v in condition["in"])
+        # one lower() per distinct value instead of per body
+        lookup = {}
+
+        def test(body):
+            value = body.get(field, missing)
+            if value is missing or isinstance(value, (list, dict)):
+                return False
+            if value not in lookup:
+                lookup[value] = str(value).lower() in values
+            return lookup[value]
+
+    elif "contains" in condition:
+        parts = tuple(str(v).lower() for v in condition["contains"])
+        lookup = {}
+
+        def test(body):
+            value = body.get(field, missing)
+            if value is missing:
+                return False
+            # lists and dicts of a Scan can not be memoized, they are searched as text
+            if isinstance(value, (list, dict)):
+                value_lower = json.dumps(value).lower()
+                return any(value_lower.find(p) >= 0 for p in parts)
+            if value not in lookup:
+                value_lower = str(value).lower()
+                lookup[value] = any(value_lower.find(p) >= 0 for p in parts)
+            return lookup[value]
+
+    elif "equals" in condition:
+        expected = condition["equals"]
+
+        def test(body):
+            return body.get(field, missing) == expected
+
+    elif "not_empty" in condition:
+        def test(body):
+            return body.get(field, '') not in ('', None)
+
+    elif "min" in condition or "max" in condition:
+        if condition.get("unit") not in UNITS:
+            raise ValueError("unknown unit {} in POI rule".format(condition.get("unit")))
+        # compare in the journal unit
+        scale = UNITS[condition.get("unit")]
+        low = condition["min"] * scale if "min" in condition else -math.inf
+        high = condition["max"] * scale if "max" in condition else math.inf
+
+        def test(body):
+            value = body.get(field)
+            return isinstance(value, (int, float)) and low <= value <= high
+
+    else:
+        raise ValueError("POI condition on {} has no operator".format(field))
+
+    return test
+
+
+def compile_rule(rule):
+    """
+    :return: function of a body and all bodies of the system returning a label or False
+    """
+    if "builtin" in rule:
+        if rule["builtin"] not in BUILTINS:
+            raise ValueError("unknown POI builtin {}".format(rule["builtin"]))
+        return BUILTINS[rule["builtin"]](rule)
+
+    label = rule["label"]
+    tests_all = [compile_condition(c) for c in rule.get("all", [])]
+    tests_any = [compile_condition(c) for c in rule.get("any", [])]
+
+    def evaluate(body, bodies):
+        for test in tests_all:
+            if not test(body):
+                return False
+        if len(tests_any) > 0 and not any(test(body) for test in tests_any):
+            return False
+        return label
+
+    return evaluate
+
+
+class PoiRules:
+    """
+    Points of interest of scanned bodies, declared as data and compiled once
+    """
+
+    def __init__(self, rules=None):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        # rules of type scan mark the body as worth mapping instead of adding a label
+        self.__scan = [compile_rule(r) for r in self.rules if r.get("type") == "scan"]
+        self.__poi = [compile_rule(r) for r in self.rules if r.get("type", "poi") == "poi"]
+
+    @classmethod
+    def load(cls, path):
+        """
+        :return: rules from a json list, the default rules if the file does not exist or is invalid
+        """
+        try:
+            with open(path, 'r') as fp:
+                return cls(json.load(fp))
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # a broken rules file must not keep the overlay from starting
+            logging.exception('Invalid POI rules in {}, using the default rules: {}'.format(path, e))
+            return cls()
+
+    def evaluate(self, bodies):
+        """
+        set ShouldScan and POI of every body in one pass
+        :param bodies: BodyID as string -> body of the current system
+        """
+        for body in bodies.values():
+            body['ShouldScan'] = any(rule(body, bodies) for rule in self.__scan)
+            poi = []
+            for rule in self.__poi:
+                value = rule(body, bodies)
+                if value:
+                    poi.append(value)
+            body['POI'] = poi
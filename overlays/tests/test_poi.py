@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from unittest import TestCase
+from overlays.poi import PoiRules, DEFAULT_RULES
+import tempfile
+import os
+
+
+class PoiRulesTestCase(TestCase):
+    def test_default_rules(self):
+        bodies = OrderedDict([
+            ('0', {"BodyID": 0, "StarType": "N"}),
+            ('1', {"BodyID": 1, "PlanetClass": "Earthlike body", "Landable": True, "SurfaceGravity": 12.0,
+                   "Radius": 6000000}),
+            ('2', {"BodyID": 2, "PlanetClass": "Icy body", "TerraformState": "Terraformable"}),
+            ('3', {"BodyID": 3, "PlanetClass": "Rocky body", "Landable": True, "SurfaceGravity": 2.0,
+                   "Radius": 1000000, "OrbitalRadius": 8000000, "Parents": [{"Planet": 1}, {"Star": 0}]}),
+        ])
+        rules = PoiRules()
+        rules.evaluate(bodies)
+        # evaluating again does not add labels twice
+        rules.evaluate(bodies)
+
+        self.assertEqual((False, ['Interesting']), (bodies['0']['ShouldScan'], bodies['0']['POI']))
+        self.assertEqual((True, ['High G planet']), (bodies['1']['ShouldScan'], bodies['1']['POI']))
+        self.assertEqual((True, []), (bodies['2']['ShouldScan'], bodies['2']['POI']))
+        self.assertFalse(bodies['3']['ShouldScan'])
+        self.assertEqual(1, len(bodies['3']['POI']))
+        self.assertTrue(bodies['3']['POI'][0].startswith('Moonrise'))
+
+    def test_custom_rules(self):
+        rules = PoiRules([
+            {"label": "Small", "all": [{"field": "Radius", "max": 1000}]},
+            {"label": "Ringed", "all": [{"field": "Rings", "not_empty": True}]},
+        ])
+        bodies = {'1': {"Radius": 500, "Rings": [{}]}, '2': {"Radius": 5000}}
+        rules.evaluate(bodies)
+        self.assertEqual(['Small', 'Ringed'], bodies['1']['POI'])
+        self.assertEqual([], bodies['2']['POI'])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            PoiRules([{"label": "x", "all": [{"field": "Radius"}]}])
+        with self.assertRaises(ValueError):
+            PoiRules([{"label": "x", "builtin": "nope"}])
+
+    def test_unhashable_values(self):
+        rules = PoiRules([
+            {"label": "Class", "all": [{"field": "Materials", "in": ["iron"]}]},
+            {"label": "Iron", "all": [{"field": "Materials", "contains": ["iron"]}]},
+        ])
+        bodies = {'1': {"Materials": [{"Name": "iron", "Percent": 20.0}]}}
+        rules.evaluate(bodies)
+        self.assertEqual(['Iron'], bodies['1']['POI'])
+
+    def test_load_invalid(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            path = os.path.join(config_dir, 'poi_rules.json')
+            for text in ('[{"label": ', '[{"label": "x", "all": [{"field": "Radius"}]}]', '{"label": "x"}'):
+                with open(path, 'w') as fp:
+                    fp.write(text)
+                with self.assertLogs(level='ERROR'):
+                    rules = PoiRules.load(path)
+                self.assertEqual(DEFAULT_RULES, rules.rules)
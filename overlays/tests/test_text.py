@@ -0,0 +1,47 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from overlays.text import TextCache
+import pygame
+
+
+class TextCacheTestCase(TestCase):
+    def test_lru(self):
+        font = MagicMock()
+        font.render.side_effect = lambda text, antialias, color: pygame.Surface((10, 10), 0, 32)
+        # room for two 10x10 32 bit surfaces
+        cache = TextCache(max_bytes=800)
+
+        a = cache.render(font, "a", (255, 0, 0))
+        self.assertIs(a, cache.render(font, "a", pygame.Color(255, 0, 0)))
+        cache.render(font, "b", (255, 0, 0))
+        cache.render(font, "a", (255, 0, 0))
+        cache.render(font, "c", (255, 0, 0))
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(800, cache.bytes)
+        self.assertEqual({"hits": 2, "misses": 3, "entries": 2, "bytes": 800}, cache.stats())
+        # b was least recently used and got evicted
+        cache.render(font, "b", (255, 0, 0))
+        self.assertEqual(4, cache.misses)
+        cache.render(font, "c", (255, 0, 0))
+        self.assertEqual(3, cache.hits)
+
+
+class PrintLineTestCase(TestCase):
+    @patch('pygame.surface.Surface')
+    @patch('pygame.font.Font')
+    def test_uncached(self, font_class, surface_class):
+        from overlays.cards.BaseCard import BaseCard
+        from overlays.text import text_cache
+        surface = surface_class()
+        surface.get_size.return_value = (300, 300)
+        card = BaseCard(surface, MagicMock())
+        font = MagicMock()
+        font.render.side_effect = lambda text, antialias, color: pygame.Surface((10, 10), 0, 32)
+
+        entries = len(text_cache)
+        for frame in range(5):
+            card.print_line(card.surface, font, "00:00:0{}".format(frame), is_cached=False)
+        self.assertEqual(entries, len(text_cache))
+        card.print_line(card.surface, font, "FINISHED")
+        self.assertEqual(entries + 1, len(text_cache))
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from overlays import constants
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces, bounded by the memory of the cached pixels.
+    Cached surfaces are shared so they must only be blitted, never drawn on.
+    """
+
+    def __init__(self, max_bytes=constants.TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.__surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    @staticmethod
+    def get_surface_bytes(surface):
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def render(self, font, text, color, antialias=False):
+        rgba = tuple(color)
+        if len(rgba) == 3:
+            rgba += (255,)
+        key = (font, text, rgba, antialias)
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.__surfaces[key] = surface
+        self.bytes += self.get_surface_bytes(surface)
+
+        while self.bytes > self.max_bytes and len(self.__surfaces) > 1:
+            _, evicted = self.__surfaces.popitem(last=False)
+            self.bytes -= self.get_surface_bytes(evicted)
+
+        return surface
+
+    def clear(self):
+        self.__surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.__surfaces),
+            "bytes": self.bytes,
+        }
+
+
+# shared by all cards
+text_cache = TextCache()
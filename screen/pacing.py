@@ -0,0 +1,75 @@
+import select
+import time
+from collections import deque
+import pygame
+
+
+class FramePacer:
+    """
+    Runs at full rate while something changes and drops to an idle rate otherwise
+    """
+
+    def __init__(self, fps=60, idle_fps=5, idle_after=1.0, history=600):
+        self.fps = fps
+        self.idle_fps = idle_fps
+        # seconds without activity before going idle
+        self.idle_after = idle_after
+        self.clock = pygame.time.Clock()
+        self.last_active = time.monotonic()
+        self.last_tick = time.monotonic()
+        # (interval between frames, time spent working) in ms
+        self.frames = deque(maxlen=history)
+
+    @property
+    def is_idle(self):
+        return time.monotonic() - self.last_active >= self.idle_after
+
+    def tick(self, is_active=True, wake_fileno=None):
+        """
+        wait for the next frame
+        :param is_active: something changed in the last frame
+        :param wake_fileno: file descriptor that ends an idle wait early when readable
+        """
+        # time spent since the end of the previous wait
+        work = (time.monotonic() - self.last_tick) * 1000
+        if is_active:
+            self.last_active = time.monotonic()
+
+        if not self.is_idle:
+            self.clock.tick(self.fps)
+        elif wake_fileno is None:
+            self.clock.tick(self.idle_fps)
+        else:
+            remaining = 1 / self.idle_fps - (time.monotonic() - self.last_tick)
+            if remaining > 0:
+                select.select([wake_fileno], [], [], remaining)
+            self.clock.tick()
+
+        now = time.monotonic()
+        self.frames.append(((now - self.last_tick) * 1000, work))
+        self.last_tick = now
+
+    @property
+    def effective_fps(self):
+        if len(self.frames) == 0:
+            return 0.0
+        total = sum(interval for interval, _ in self.frames)
+        if total == 0:
+            return 0.0
+        return len(self.frames) * 1000 / total
+
+    def get_frame_time_percentiles(self, percentiles=(50, 95, 99)):
+        """
+        :return: {percentile: ms spent working on a frame}
+        """
+        work = sorted(w for _, w in self.frames)
+        if len(work) == 0:
+            return {p: 0 for p in percentiles}
+        return {p: work[min(len(work) - 1, int(len(work) * p / 100))] for p in percentiles}
+
+    def report(self):
+        percentiles = self.get_frame_time_percentiles()
+        return "{:0.1f} fps, frame time {}".format(
+            self.effective_fps,
+            " ".join("p{}: {:0.2f}ms".format(p, ms) for p, ms in sorted(percentiles.items())),
+        )
@@ -3,13 +3,20 @@ import pygame
 from pygame.locals import *
 import os
 from overlays.constants import TITLE
+from screen.pacing import FramePacer
 
 
 class Window(object):
-    def __init__(self, size=None, is_overlay=False, color=(0, 255, 0)):
+    def __init__(self, size=None, is_overlay=False, color=(0, 255, 0), is_headless=False):
         self.mask_color = color
-        self.fps = 60
-        self.clock = pygame.time.Clock()
+        self.pacer = FramePacer()
+
+        # render off screen, frames are only read back from the surface
+        if is_headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            is_overlay = False
+            if size is None:
+                size = (1280, 720)
 
         if is_overlay and os.name == 'nt':
             os.environ['SDL_VIDEO_WINDOW_POS'] = "0,0"
@@ -48,8 +55,16 @@ class Window(object):
         width, height = pygame.display.get_surface().get_size()
         return height
 
-    def loop(self):
-        self.clock.tick(self.fps)
+    @property
+    def fps(self):
+        return self.pacer.fps
+
+    def loop(self, is_active=True, wake_fileno=None):
+        """
+        :param is_active: something changed in the last frame, otherwise the window idles at a lower rate
+        :param wake_fileno: file descriptor that wakes the window up when readable while idle
+        """
+        self.pacer.tick(is_active, wake_fileno)
         events = pygame.event.get()
 
         for e in events:
@@ -0,0 +1,105 @@
+import struct
+import time
+import pygame
+
+
+def get_frame_bytes(surface):
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    return to_bytes(surface, 'RGBA')
+
+
+class FrameEncoder:
+    """
+    RGBA bytes of the display, which has no alpha channel and leaves its padding byte undefined
+    """
+
+    def __init__(self):
+        # surface with per pixel alpha the display is copied onto, reused while the size does not change
+        self.frame = None
+
+    def encode(self, surface):
+        if surface.get_masks()[3] != 0:
+            return get_frame_bytes(surface)
+        if self.frame is None or self.frame.get_size() != surface.get_size():
+            self.frame = pygame.Surface(surface.get_size(), pygame.SRCALPHA, 32)
+        # a blit from a surface without alpha writes opaque pixels
+        self.frame.blit(surface, (0, 0))
+        return get_frame_bytes(self.frame)
+
+
+class FileSink:
+    """
+    Writes raw RGBA frames back to back to a file or named pipe
+    """
+    # a pipe reader like an encoder expects a steady frame rate
+    is_constant_rate = True
+
+    def __init__(self, path):
+        self.path = path
+        # opening a named pipe waits for its reader
+        self.fp = open(path, 'wb')
+        self.encoder = FrameEncoder()
+
+    def write(self, surface):
+        self.fp.write(self.encoder.encode(surface))
+        self.fp.flush()
+
+    def close(self):
+        self.fp.close()
+
+
+class SharedMemorySink:
+    """
+    Ring buffer of raw RGBA frames in POSIX shared memory.
+
+    The header is followed by `slots` frames of width * height * 4 bytes. The
+    newest frame is in slot (counter - 1) % slots. Readers map the block and read it in place.
+    """
+    MAGIC = b'EDCF'
+    VERSION = 1
+    # magic, version, width, height, slots, frame size, frame counter, frame time
+    HEADER = struct.Struct('<4sIIIIQQd')
+    # readers only look at the newest frame so idle rate is fine
+    is_constant_rate = False
+
+    def __init__(self, name, width, height, slots=3):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise OSError("shared memory output requires python 3.8 or newer")
+
+        self.width = width
+        self.height = height
+        self.slots = slots
+        self.frame_size = width * height * 4
+        self.counter = 0
+        self.encoder = FrameEncoder()
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=True, size=self.HEADER.size + self.frame_size * slots
+        )
+        self.__write_header(0.0)
+
+    def __write_header(self, frame_time):
+        self.HEADER.pack_into(self.memory.buf, 0, self.MAGIC, self.VERSION, self.width, self.height, self.slots,
+                              self.frame_size, self.counter, frame_time)
+
+    def write(self, surface):
+        frame = self.encoder.encode(surface)
+        offset = self.HEADER.size + (self.counter % self.slots) * self.frame_size
+        self.memory.buf[offset:offset + self.frame_size] = frame
+        # publish after the frame is complete
+        self.counter += 1
+        self.__write_header(time.time())
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+def create_sink(target, width, height):
+    """
+    :param target: shm:<name> for shared memory, anything else is a file or named pipe path
+    """
+    if target.startswith('shm:'):
+        return SharedMemorySink(target[len('shm:'):], width, height)
+    return FileSink(target)
@@ -0,0 +1,30 @@
+from unittest import TestCase
+from screen.sinks import FileSink
+import pygame
+import tempfile
+import shutil
+import os
+
+
+class FileSinkTestCase(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_opaque_frames(self):
+        # like the display, 32 bit without an alpha channel
+        surface = pygame.Surface((4, 2), 0, 32)
+        self.assertEqual(0, surface.get_masks()[3])
+        path = os.path.join(self.dir, 'frames.raw')
+
+        sink = FileSink(path)
+        surface.fill((10, 20, 30))
+        sink.write(surface)
+        surface.fill((1, 2, 3))
+        sink.write(surface)
+        sink.close()
+
+        with open(path, 'rb') as fp:
+            self.assertEqual(bytes([10, 20, 30, 255]) * 8 + bytes([1, 2, 3, 255]) * 8, fp.read())
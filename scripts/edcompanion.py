@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 from screen import Window
+from screen.sinks import create_sink
 from data.journal import JournalWatcher
+from data.notify import create_notifier
+from data.ingest import ThreadedJournal
+from data.index import IndexUpdater
+from data.results import RaceResults
+from data.stats import ExplorationStats
+from overlays.poi import PoiRules
+from data.systems import SystemStore
+from data.spatial import SpatialIndex, StarLoader
 import pygame
 import argparse
+import os
 import re
 from overlays import cards
 from data.config import Config, get_config_dir, get_logger_config
@@ -24,6 +34,15 @@ def main(*args):
     parser.add_argument('--config', '-c', type=str, default='', help="config path")
     parser.add_argument('--simulator', type=str, choices=['race', 'exploration'], default=None)
     parser.add_argument('--arg1', type=str, default=None)
+    parser.add_argument('--notifier', type=str, choices=['inotify', 'polling'], default=None,
+                        help="journal change notification backend (default: best available)")
+    parser.add_argument('--scale-fonts', default=False, action='store_true',
+                        help="scale font sizes with the window height")
+    parser.add_argument('--headless', type=str, default=None, metavar='OUTPUT',
+                        help="no window, write raw RGBA frames to a file, a named pipe "
+                             "or shm:<name> (shared memory ring buffer)")
+    parser.add_argument('--threaded', default=False, action='store_true',
+                        help="read journal and status files in a background thread")
 
     if len(args) == 0:
         args = None
@@ -48,10 +67,19 @@ def main(*args):
         else:
             size = None
 
-    win = Window(size=size, is_overlay=args.overlay, color=pygame.Color(args.background))
+    win = Window(size=size, is_overlay=args.overlay, color=pygame.Color(args.background),
+                 is_headless=args.headless is not None)
+
+    sink = None
+    if args.headless:
+        sink = create_sink(args.headless, win.width, win.height)
+        if sink.is_constant_rate:
+            win.pacer.idle_fps = win.pacer.fps
 
     watch_list = []
     card_list = []
+    # stores with a close() to call on shutdown
+    closing = []
 
     if args.config:
         config = Config(config_dir=args.config)
@@ -61,31 +89,58 @@ def main(*args):
     journal = JournalWatcher(
         watch=[],
         directory=journal_path,
-        config=config
+        config=config,
+        notifier=create_notifier(journal_path, args.notifier)
     )
 
+    if args.threaded:
+        journal = ThreadedJournal(journal)
+
     if args.activity == 'race':
         config.select_race(args.arg1)
 
     def append_card(card_class, **kwargs):
-        c = card_class(win.screen, journal, **kwargs)
+        c = card_class(win.screen, journal, background=win.mask_color, scale_fonts=args.scale_fonts, **kwargs)
+        c.subscribe(journal.bus)
         for w in c.watched():
             watch_list.append(w)
         card_list.append(c)
 
     if args.activity == 'exploration':
-        # exploration card
-        append_card(cards.ExplorationCard, position=(0, 1), card_size=(1, 2))
+        # exploration card, its totals are caught up once the journal index is up to date
+        stats = ExplorationStats(config.get_stats_path())
+        index_updater = IndexUpdater(config.get_index_path(), journal_path, on_done=stats.catch_up)
+        index_updater.start()
+        # stopped before the stats it may still be writing are closed
+        closing.append(index_updater)
+        closing.append(stats)
+        append_card(cards.ExplorationCard, position=(0, 1), card_size=(1, 2), stats=stats,
+                    index_updater=index_updater)
         # current system card
-        append_card(cards.CurrentSystemCard, position=(2, 1), text_align='right', card_size=(1, 2))
+        # visited systems are written in batches, the last ones when the overlay closes
+        system_store = SystemStore(config.get_systems_path())
+        closing.append(system_store)
+        append_card(cards.CurrentSystemCard, position=(2, 1), text_align='right', card_size=(1, 2),
+                    rules=PoiRules.load(config.get_poi_rules_path()), system_store=system_store)
         # route card
-        append_card(cards.RouteCard, position=(0, 0), text_align='left', card_size=(3, 1))
+        stars_path = config.get_stars_path()
+        stars = None
+        if os.path.isfile(stars_path):
+            stars = StarLoader(stars_path)
+            stars.start()
+            closing.append(stars)
+        append_card(cards.RouteCard, position=(0, 0), text_align='left', card_size=(3, 1),
+                    spatial=SpatialIndex(), stars=stars)
 
     elif args.activity == 'race':
+        results = RaceResults(config.get_results_path())
+        closing.append(results)
         if args.overlay:
-            append_card(cards.RaceCard, position=(2, 0), card_size=(1, 1))
+            append_card(cards.RaceCard, position=(2, 0), card_size=(1, 1),
+                        telemetry_dir=config.get_telemetry_dir(), results=results)
         else:
-            append_card(cards.RaceCard, position=(0, 0), card_size=(3, 3))
+            append_card(cards.RaceCard, position=(0, 0), card_size=(3, 3),
+                        telemetry_dir=config.get_telemetry_dir(), results=results)
 
     elif args.activity == 'create-race':
         if args.overlay:
@@ -98,22 +153,51 @@ def main(*args):
     journal.watch = list(set(watch_list))
 
     win.screen.fill(win.mask_color)
+    pygame.display.update()
 
     sim = None
     if args.simulator:
         sim = SimRunner(Simulator(args.simulator).get_generator())
 
-    while win.loop():
+    if args.threaded:
+        journal.start()
+
+    notifier = getattr(journal, 'notifier', None)
+    wake_fileno = notifier.fileno() if notifier is not None else None
+
+    is_active = True
+    try:
+        while win.loop(is_active, wake_fileno):
+
+            if sim:
+                sim.run()
+
+            journal.refresh()
+            # only the cards that changed are drawn and sent to the display
+            dirty_rects = []
+            for card in card_list:
+                rect = card.render()
+                if rect is not None:
+                    dirty_rects.append(rect)
+
+            if len(dirty_rects) > 0:
+                pygame.display.update(dirty_rects)
+
+            if sink:
+                sink.write(win.screen)
+
+            is_active = journal.is_modified or len(dirty_rects) > 0 or (sim is not None and sim.active)
+    finally:
+        print('Rendering: {}'.format(win.pacer.report()))
 
-        if sim:
-            sim.run()
+        if sink:
+            sink.close()
 
-        journal.refresh()
-        win.screen.fill(win.mask_color)
-        for card in card_list:
-            card.render()
+        if args.threaded:
+            journal.stop()
 
-        pygame.display.update()
+        for store in closing:
+            store.close()
 
 
 class SimRunner():
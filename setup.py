@@ -20,6 +20,9 @@ setup(
     python_requires=">=3.5",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     entry_points={
         'gui_scripts': [
             'edcompanion-launcher=scripts.launcher:main',